@@ -1,10 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from auth.deps import get_admin_user
 from auth.simple import get_password_hash
 from database import get_db
-from models import User, Collection, CollectionPermission, UserPaperMeta, ImportTask
+from models import (
+    User,
+    Collection,
+    CollectionPermission,
+    UserPaperMeta,
+    ImportTask,
+    CrawlTask,
+)
 from schemas.user import (
     AdminUserCreate,
     AdminPasswordReset,
@@ -13,7 +23,9 @@ from schemas.user import (
     AdminUserUpdate,
 )
 
-router = APIRouter(prefix="/api/admin", tags=["admin"])
+router = APIRouter(
+    prefix="/api/admin", tags=["admin"], default_response_class=ORJSONResponse
+)
 
 
 @router.get("/users", response_model=list[AdminUserOut])
@@ -21,18 +33,21 @@ def list_users(
     db: Session = Depends(get_db),
     _admin: User = Depends(get_admin_user),
 ):
-    users = db.query(User).order_by(User.created_at).all()
-    return [
-        AdminUserOut(
-            id=u.id,
-            username=u.username,
-            email=u.email,
-            display_name=u.display_name,
-            is_active=u.is_active,
-            created_at=u.created_at,
+    # Stream plain column tuples instead of full ORM objects; the DB already
+    # guarantees the shape, so model_construct can skip re-validation.
+    rows = db.execute(
+        select(
+            User.id,
+            User.username,
+            User.email,
+            User.display_name,
+            User.is_active,
+            User.created_at,
         )
-        for u in users
-    ]
+        .order_by(User.created_at)
+        .execution_options(yield_per=1000)
+    )
+    return [AdminUserOut.model_construct(**row._mapping) for row in rows]
 
 
 @router.get("/users/search")
@@ -42,13 +57,19 @@ def admin_search_users(
     db: Session = Depends(get_db),
     _admin: User = Depends(get_admin_user),
 ):
-    query = db.query(User).filter(User.username.ilike(f"%{q}%"), User.is_active)
+    # SQLite's LIKE is already case-insensitive for ASCII (same folding as its
+    # lower()), so plain LIKE matches ilike() semantics without the per-row
+    # lower() calls that ilike() compiles to. Select only the returned columns
+    # so the row never carries password_hash, oauth_* and friends.
+    stmt = select(User.id, User.username, User.display_name).where(
+        User.username.like(f"%{q}%"), User.is_active
+    )
     if exclude:
-        query = query.filter(User.id != exclude)
-    users = query.limit(10).all()
+        stmt = stmt.where(User.id != exclude)
+    rows = db.execute(stmt.limit(10)).all()
     return [
-        {"user_id": u.id, "username": u.username, "display_name": u.display_name}
-        for u in users
+        {"user_id": r.id, "username": r.username, "display_name": r.display_name}
+        for r in rows
     ]
 
 
@@ -58,9 +79,6 @@ def create_user(
     db: Session = Depends(get_db),
     _admin: User = Depends(get_admin_user),
 ):
-    if db.query(User).filter(User.username == body.username).first():
-        raise HTTPException(status_code=400, detail="Username already exists")
-
     user = User(
         username=body.username,
         email=body.email,
@@ -68,10 +86,18 @@ def create_user(
         password_hash=get_password_hash(body.password),
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    try:
+        # Let the UNIQUE indexes catch conflicts instead of pre-checking —
+        # one statement instead of two, and race-free.
+        db.flush()
+    except IntegrityError as err:
+        db.rollback()
+        field = "Email" if "email" in str(err.orig) else "Username"
+        raise HTTPException(status_code=400, detail=f"{field} already exists")
 
-    return AdminUserOut(
+    # Build the response before commit expires the instance; all values are
+    # client-generated, so no refresh round-trip is needed.
+    out = AdminUserOut.model_construct(
         id=user.id,
         username=user.username,
         email=user.email,
@@ -79,6 +105,8 @@ def create_user(
         is_active=user.is_active,
         created_at=user.created_at,
     )
+    db.commit()
+    return out
 
 
 @router.get("/users/check")
@@ -100,7 +128,7 @@ def check_user_field(
         raise HTTPException(status_code=400, detail="Invalid field")
     if exclude_id:
         q = q.filter(User.id != exclude_id)
-    return {"available": q.first() is None}
+    return {"available": not db.query(q.exists()).scalar()}
 
 
 @router.put("/users/{user_id}", response_model=AdminUserOut)
@@ -110,35 +138,27 @@ def update_user(
     db: Session = Depends(get_db),
     _admin: User = Depends(get_admin_user),
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if body.username is not None and body.username != user.username:
-        if (
-            db.query(User)
-            .filter(User.username == body.username, User.id != user_id)
-            .first()
-        ):
-            raise HTTPException(status_code=400, detail="Username already exists")
+    if body.username is not None:
         user.username = body.username
 
-    if body.email is not None and body.email != user.email:
-        if (
-            body.email
-            and db.query(User)
-            .filter(User.email == body.email, User.id != user_id)
-            .first()
-        ):
-            raise HTTPException(status_code=400, detail="Email already exists")
+    if body.email is not None:
         user.email = body.email or None
 
     if body.display_name is not None:
         user.display_name = body.display_name
 
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as err:
+        db.rollback()
+        field = "Email" if "email" in str(err.orig) else "Username"
+        raise HTTPException(status_code=400, detail=f"{field} already exists")
     db.refresh(user)
-    return AdminUserOut(
+    return AdminUserOut.model_construct(
         id=user.id,
         username=user.username,
         email=user.email,
@@ -155,7 +175,7 @@ def reset_password(
     db: Session = Depends(get_db),
     _admin: User = Depends(get_admin_user),
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -170,7 +190,7 @@ def toggle_active(
     db: Session = Depends(get_db),
     admin: User = Depends(get_admin_user),
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if user.id == admin.id:
@@ -191,7 +211,7 @@ def delete_user(
     db: Session = Depends(get_db),
     admin: User = Depends(get_admin_user),
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if user.id == admin.id:
@@ -200,7 +220,7 @@ def delete_user(
     if body.mode == "transfer":
         if not body.transfer_to:
             raise HTTPException(status_code=400, detail="transfer_to is required")
-        target = db.query(User).filter(User.id == body.transfer_to).first()
+        target = db.get(User, body.transfer_to)
         if not target:
             raise HTTPException(status_code=404, detail="Target user not found")
         if target.id == user.id:
@@ -210,33 +230,62 @@ def delete_user(
         db.query(Collection).filter(Collection.created_by == user.id).update(
             {"created_by": target.id}
         )
-        existing = {
-            (p.collection_id, p.permission)
-            for p in db.query(CollectionPermission)
-            .filter(CollectionPermission.user_id == target.id)
-            .all()
-        }
-        for perm in (
-            db.query(CollectionPermission)
-            .filter(CollectionPermission.user_id == user.id)
-            .all()
-        ):
-            if (perm.collection_id, perm.permission) in existing:
-                db.delete(perm)
-            else:
-                perm.user_id = target.id
+        # Reassign permissions set-based: move rows that would not collide with
+        # the target's existing grants, then drop the colliding leftovers.
+        target_perms = select(
+            CollectionPermission.collection_id, CollectionPermission.permission
+        ).where(CollectionPermission.user_id == target.id)
+        db.execute(
+            update(CollectionPermission)
+            .where(
+                CollectionPermission.user_id == user.id,
+                tuple_(
+                    CollectionPermission.collection_id,
+                    CollectionPermission.permission,
+                ).not_in(target_perms),
+            )
+            .values(user_id=target.id)
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(
+            delete(CollectionPermission)
+            .where(CollectionPermission.user_id == user.id)
+            .execution_options(synchronize_session=False)
+        )
         db.query(ImportTask).filter(ImportTask.user_id == user.id).update(
             {"user_id": target.id}
         )
+        db.query(CrawlTask).filter(CrawlTask.user_id == user.id).update(
+            {"user_id": target.id}
+        )
     else:
         db.query(CollectionPermission).filter(
             CollectionPermission.user_id == user.id
-        ).delete()
-        db.query(ImportTask).filter(ImportTask.user_id == user.id).delete()
-        for col in db.query(Collection).filter(Collection.created_by == user.id).all():
-            db.delete(col)
+        ).delete(synchronize_session=False)
+        db.query(ImportTask).filter(ImportTask.user_id == user.id).delete(
+            synchronize_session=False
+        )
+        # Runs cascade from the crawl_tasks FK
+        db.query(CrawlTask).filter(CrawlTask.user_id == user.id).delete(
+            synchronize_session=False
+        )
+        # Detach other users' import tasks pointing at collections about to go
+        # away; databases created before the SET NULL FK would otherwise block
+        # the delete below.
+        db.query(ImportTask).filter(
+            ImportTask.collection_id.in_(
+                select(Collection.id).where(Collection.created_by == user.id)
+            )
+        ).update({"collection_id": None}, synchronize_session=False)
+        # Single bulk DELETE; dependent rows are cleaned up by the
+        # ON DELETE CASCADE foreign keys on collection children.
+        db.query(Collection).filter(Collection.created_by == user.id).delete(
+            synchronize_session=False
+        )
 
-    db.query(UserPaperMeta).filter(UserPaperMeta.user_id == user.id).delete()
+    db.query(UserPaperMeta).filter(UserPaperMeta.user_id == user.id).delete(
+        synchronize_session=False
+    )
     db.delete(user)
     db.commit()
 
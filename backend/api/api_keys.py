@@ -1,6 +1,8 @@
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from auth.deps import get_current_user
@@ -8,7 +10,9 @@ from database import get_db
 from models import User
 from models.api_key import ApiKey
 
-router = APIRouter(prefix="/api/api-keys", tags=["api-keys"])
+router = APIRouter(
+    prefix="/api/api-keys", tags=["api-keys"], default_response_class=ORJSONResponse
+)
 
 
 class ApiKeyCreate(BaseModel):
@@ -38,23 +42,22 @@ def list_api_keys(
     db: Session = Depends(get_db),
 ) -> list[ApiKeyOut]:
     """List all API keys for the current user."""
-    keys = (
-        db.query(ApiKey)
-        .filter(ApiKey.user_id == user.id)
+    # Stream only the displayed columns; skip ORM instrumentation and
+    # Pydantic re-validation for rows the DB already constrains.
+    rows = db.execute(
+        select(
+            ApiKey.id,
+            ApiKey.name,
+            ApiKey.key_prefix,
+            ApiKey.is_active,
+            ApiKey.last_used_at,
+            ApiKey.created_at,
+        )
+        .where(ApiKey.user_id == user.id)
         .order_by(ApiKey.created_at.desc())
-        .all()
+        .execution_options(yield_per=1000)
     )
-    return [
-        ApiKeyOut(
-            id=k.id,
-            name=k.name,
-            key_prefix=k.key_prefix,
-            is_active=k.is_active,
-            last_used_at=k.last_used_at,
-            created_at=k.created_at,
-        )
-        for k in keys
-    ]
+    return [ApiKeyOut.model_construct(**row._mapping) for row in rows]
 
 
 @router.post("")
@@ -78,16 +81,19 @@ def create_api_key(
         is_active=True,
     )
     db.add(api_key)
-    db.commit()
-    db.refresh(api_key)
+    db.flush()
 
-    return ApiKeyCreated(
+    # Build the response before commit expires the instance; every field is
+    # client-generated, so the post-commit refresh round-trip is unnecessary.
+    created = ApiKeyCreated(
         id=api_key.id,
         name=api_key.name,
         key=plain_key,  # Return full key only once
         key_prefix=key_prefix,
         created_at=api_key.created_at,
     )
+    db.commit()
+    return created
 
 
 @router.delete("/{key_id}")
@@ -97,10 +103,8 @@ def delete_api_key(
     db: Session = Depends(get_db),
 ):
     """Delete an API key."""
-    api_key = (
-        db.query(ApiKey).filter(ApiKey.id == key_id, ApiKey.user_id == user.id).first()
-    )
-    if not api_key:
+    api_key = db.get(ApiKey, key_id)
+    if not api_key or api_key.user_id != user.id:
         raise HTTPException(404, "API key not found")
 
     db.delete(api_key)
@@ -115,17 +119,13 @@ def toggle_api_key(
     db: Session = Depends(get_db),
 ) -> ApiKeyOut:
     """Toggle API key active status."""
-    api_key = (
-        db.query(ApiKey).filter(ApiKey.id == key_id, ApiKey.user_id == user.id).first()
-    )
-    if not api_key:
+    api_key = db.get(ApiKey, key_id)
+    if not api_key or api_key.user_id != user.id:
         raise HTTPException(404, "API key not found")
 
     api_key.is_active = not api_key.is_active
-    db.commit()
-    db.refresh(api_key)
 
-    return ApiKeyOut(
+    out = ApiKeyOut(
         id=api_key.id,
         name=api_key.name,
         key_prefix=api_key.key_prefix,
@@ -133,3 +133,5 @@ def toggle_api_key(
         last_used_at=api_key.last_used_at,
         created_at=api_key.created_at,
     )
+    db.commit()
+    return out
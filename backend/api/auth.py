@@ -3,31 +3,54 @@ from urllib.parse import urlencode
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
+from sqlalchemy import and_, bindparam, lambda_stmt, or_, select
 from sqlalchemy.orm import Session
 
 from auth.deps import get_current_user
 from auth.jwt_handler import create_access_token
-from auth.simple import verify_password
+from auth.simple import DUMMY_PASSWORD_HASH, verify_password
 from config import config
 from database import get_db
 from models import User
 from schemas import LoginRequest, TokenResponse, UserOut
+from services.collection_cache import TTLStore
 
-router = APIRouter(prefix="/api/auth", tags=["auth"])
+router = APIRouter(
+    prefix="/api/auth", tags=["auth"], default_response_class=ORJSONResponse
+)
 
-# In-memory state store for OAuth CSRF protection
-_oauth_states: dict[str, bool] = {}
+# Shared client so OAuth token/userinfo calls reuse pooled TCP+TLS connections
+# instead of paying a fresh handshake per callback. Async so the provider
+# round-trip doesn't occupy a threadpool slot; closed in app shutdown.
+_http = httpx.AsyncClient(
+    timeout=10.0,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+)
+
+# Statements on the hot auth path, compiled once and reused by identity.
+_user_by_username = lambda_stmt(
+    lambda: select(User).where(User.username == bindparam("username"))
+)
+
+# In-memory state store for OAuth CSRF protection. Entries expire after ten
+# minutes and the store is capped so abandoned handshakes cannot grow memory
+# without bound.
+_oauth_states = TTLStore(ttl=600, max_entries=10_000)
 
 
 @router.post("/login", response_model=TokenResponse)
 def login(req: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.username == req.username).first()
-    if (
-        user is None
-        or not user.password_hash
-        or not verify_password(req.password, user.password_hash)
-    ):
+    user = db.execute(
+        _user_by_username, {"username": req.username}
+    ).scalar_one_or_none()
+    # Always verify against some hash so that a missing user costs the same
+    # wall-clock time as a wrong password.
+    pw_hash = (
+        user.password_hash if user and user.password_hash else DUMMY_PASSWORD_HASH
+    )
+    ok = verify_password(req.password, pw_hash)
+    if user is None or not user.password_hash or not ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
         )
@@ -40,27 +63,34 @@ def login(req: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserOut)
-def get_me(current_user: User = Depends(get_current_user)):
-    out = UserOut.model_validate(current_user)
-    # Check both database field and config for backward compatibility
-    out.is_admin = (
-        current_user.is_admin or current_user.username == config.admin_username
+async def get_me(current_user: User = Depends(get_current_user)):
+    # DB-sourced fields are already the right shape; model_construct skips
+    # the validator pipeline. is_admin checks both the database field and
+    # config for backward compatibility.
+    return UserOut.model_construct(
+        id=current_user.id,
+        username=current_user.username,
+        email=current_user.email,
+        display_name=current_user.display_name,
+        is_active=current_user.is_active,
+        is_admin=current_user.is_admin
+        or current_user.username == config.admin_username,
+        created_at=current_user.created_at,
     )
-    return out
 
 
 # ── OAuth login flow ──
 
 
 @router.get("/oauth/start")
-def oauth_start():
+async def oauth_start():
     """Return the OAuth authorization URL for the configured provider."""
     oauth = config.auth.oauth
     if not oauth.client_id or not oauth.authorization_endpoint:
         raise HTTPException(400, "OAuth is not configured")
 
     state = secrets.token_urlsafe(32)
-    _oauth_states[state] = True
+    _oauth_states.put(state)
 
     params = {
         "client_id": oauth.client_id,
@@ -74,19 +104,18 @@ def oauth_start():
 
 
 @router.get("/oauth/callback")
-def oauth_callback(code: str, state: str, db: Session = Depends(get_db)):
+async def oauth_callback(code: str, state: str, db: Session = Depends(get_db)):
     """Exchange authorization code for user info, find existing user, return JWT via redirect."""
-    if state not in _oauth_states:
+    if not _oauth_states.consume(state):
         raise HTTPException(400, "Invalid OAuth state")
-    _oauth_states.pop(state, None)
 
     oauth = config.auth.oauth
-    token_data = _exchange_code(oauth, code)
+    token_data = await _exchange_code(oauth, code)
     access_token = token_data.get("access_token")
     if not access_token:
         raise HTTPException(400, "Failed to obtain access token from OAuth provider")
 
-    userinfo = _get_userinfo(oauth, access_token)
+    userinfo = await _get_userinfo(oauth, access_token)
     oauth_sub = str(userinfo.get("sub") or userinfo.get("id") or "")
     if not oauth_sub:
         raise HTTPException(400, "OAuth provider did not return a user identifier")
@@ -95,33 +124,30 @@ def oauth_callback(code: str, state: str, db: Session = Depends(get_db)):
     groups = userinfo.get("groups", [])
     is_admin = oauth.admin_group in groups if isinstance(groups, list) else False
 
-    # First try to find user by oauth_sub
-    user = (
-        db.query(User)
-        .filter(
-            User.oauth_provider == oauth.provider,
-            User.oauth_sub == oauth_sub,
-        )
-        .first()
-    )
-
-    # If not found by oauth_sub, try to find by email (for migration after OAuth provider changes)
+    # Fetch the oauth_sub match and the email fallback (for migration after
+    # OAuth provider changes) in one round-trip, preferring the exact match.
     email = userinfo.get("email")
-    if user is None and email:
-        user = (
-            db.query(User)
-            .filter(
-                User.email == email,
-                User.oauth_provider.isnot(None),
-            )
-            .first()
-        )
-        if user:
-            # Update oauth_sub and oauth_provider for this user (migration case)
-            user.oauth_sub = oauth_sub
-            user.oauth_provider = oauth.provider
-            db.commit()
-            db.refresh(user)
+    conditions = [
+        and_(User.oauth_provider == oauth.provider, User.oauth_sub == oauth_sub)
+    ]
+    if email:
+        conditions.append(and_(User.email == email, User.oauth_provider.isnot(None)))
+    candidates = db.execute(select(User).where(or_(*conditions))).scalars().all()
+
+    user = next(
+        (
+            u
+            for u in candidates
+            if u.oauth_provider == oauth.provider and u.oauth_sub == oauth_sub
+        ),
+        None,
+    )
+    if user is None and candidates:
+        # Matched by email only: update oauth_sub/oauth_provider (migration case)
+        user = candidates[0]
+        user.oauth_sub = oauth_sub
+        user.oauth_provider = oauth.provider
+        db.commit()
 
     if user is None:
         # Auto-create user on first OAuth login
@@ -147,10 +173,22 @@ def oauth_callback(code: str, state: str, db: Session = Depends(get_db)):
             db.refresh(existing_user)
             user = existing_user
         else:
-            # Create new user with unique username if needed
+            # Create new user with unique username if needed. One LIKE query
+            # fetches every colliding name; the free suffix is picked in Python.
             base_username = username
+            taken = {
+                row[0]
+                for row in db.execute(
+                    select(User.username).where(
+                        or_(
+                            User.username == base_username,
+                            User.username.like(f"{base_username}\\_%", escape="\\"),
+                        )
+                    )
+                )
+            }
             counter = 1
-            while db.query(User).filter(User.username == username).first():
+            while username in taken:
                 username = f"{base_username}_{counter}"
                 counter += 1
 
@@ -180,8 +218,8 @@ def oauth_callback(code: str, state: str, db: Session = Depends(get_db)):
     return RedirectResponse(f"/?token={jwt_token}")
 
 
-def _exchange_code(oauth, code: str) -> dict:
-    resp = httpx.post(
+async def _exchange_code(oauth, code: str) -> dict:
+    resp = await _http.post(
         oauth.token_endpoint,
         data={
             "grant_type": "authorization_code",
@@ -196,8 +234,8 @@ def _exchange_code(oauth, code: str) -> dict:
     return resp.json()
 
 
-def _get_userinfo(oauth, access_token: str) -> dict:
-    resp = httpx.get(
+async def _get_userinfo(oauth, access_token: str) -> dict:
+    resp = await _http.get(
         oauth.userinfo_endpoint,
         headers={
             "Authorization": f"Bearer {access_token}",
@@ -1,13 +1,25 @@
+import logging
 import uuid
+from collections import defaultdict
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import Response
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, load_only
 
 from auth.deps import get_current_user, get_current_user_optional
-from database import get_db
-from models import User, Collection, Paper, CollectionPaper, CollectionPermission
+from database import SessionLocal, eager_opts, get_db
+from models import (
+    User,
+    Collection,
+    Paper,
+    CollectionPaper,
+    CollectionPermission,
+    ImportTask,
+)
 from schemas import (
     CollectionCreate,
     CollectionUpdate,
@@ -17,15 +29,22 @@ from schemas import (
     PermissionCreate,
     PermissionOut,
     CollectionPaperAdd,
+    CollectionPaperBulkAdd,
     CollectionPaperUpdate,
     PaperReorder,
 )
 from schemas.collection import StatsOut, UserBrief, GroupOut, SectionOut, PaperInGroup
 from services.permission_service import check_collection_permission
+from services.collection_cache import (
+    invalidate_collection_caches,
+    list_cache_get,
+    list_cache_put,
+)
 from services.deduplication import normalize_title
-from import_module.bibtex_exporter import export_papers_to_bibtex
+from import_module.bibtex_exporter import paper_to_bibtex_entry
 
 router = APIRouter(prefix="/api/collections", tags=["collections"])
+logger = logging.getLogger(__name__)
 
 
 @router.get("/check-id")
@@ -44,46 +63,106 @@ def _user_brief(user: User) -> UserBrief:
     )
 
 
-def _collection_stats(db: Session, collection_id: str) -> StatsOut:
-    cps = (
-        db.query(CollectionPaper)
-        .filter(CollectionPaper.collection_id == collection_id)
+def _collection_stats_bulk(
+    db: Session, collection_ids: list[str]
+) -> dict[str, StatsOut]:
+    """Compute paper stats for many collections with one grouped query."""
+    stats = {cid: StatsOut() for cid in collection_ids}
+    if not collection_ids:
+        return stats
+    rows = (
+        db.query(CollectionPaper.collection_id, Paper.status, func.count())
+        .join(Paper, Paper.id == CollectionPaper.paper_id)
+        .filter(CollectionPaper.collection_id.in_(collection_ids))
+        .group_by(CollectionPaper.collection_id, Paper.status)
         .all()
     )
-    paper_ids = [cp.paper_id for cp in cps]
-    if not paper_ids:
-        return StatsOut()
-    papers = db.query(Paper).filter(Paper.id.in_(paper_ids)).all()
-    accessible = sum(1 for p in papers if p.status == "accessible")
-    return StatsOut(
-        total=len(papers), accessible=accessible, no_access=len(papers) - accessible
-    )
+    for cid, paper_status, count in rows:
+        s = stats[cid]
+        s.total += count
+        if paper_status == "accessible":
+            s.accessible += count
+        else:
+            s.no_access += count
+    return stats
+
+
+def _collection_stats(db: Session, collection_id: str) -> StatsOut:
+    return _collection_stats_bulk(db, [collection_id])[collection_id]
 
 
 @router.get("", response_model=list[CollectionListOut])
 def list_collections(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=200),
+    cursor: datetime | None = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
 ):
-    # Collections the user can see: own, shared with them, or public
-    own = db.query(Collection).filter(Collection.created_by == current_user.id)
-    shared_ids = (
-        db.query(CollectionPermission.collection_id)
-        .filter(CollectionPermission.user_id == current_user.id)
-        .subquery()
+    # Keyset pagination is opt-in: existing clients fetch the full list, and
+    # paginated clients follow the X-Next-Cursor header. Only the full list
+    # is cached, so a paginated request always hits the database.
+    paginated = limit is not None or cursor is not None
+    if not paginated:
+        cached = list_cache_get(current_user.id)
+        if cached is not None:
+            return cached
+
+    # Collections the user can see: own, shared with them, or public.
+    # One OR filter lets the planner index-scan each branch instead of
+    # materializing three UNION subselects.
+    shared_ids = select(CollectionPermission.collection_id).where(
+        CollectionPermission.user_id == current_user.id
     )
-    shared = db.query(Collection).filter(Collection.id.in_(shared_ids))
-    public = db.query(Collection).filter(
-        Collection.visibility.in_(["public", "public_editable"])
-    )
-    collections = (
-        own.union(shared).union(public).order_by(Collection.created_at.desc()).all()
+    query = (
+        db.query(Collection)
+        .filter(
+            or_(
+                Collection.created_by == current_user.id,
+                Collection.visibility.in_(["public", "public_editable"]),
+                Collection.id.in_(shared_ids),
+            )
+        )
+        .options(
+            # Project only the fields CollectionListOut needs; task_config
+            # JSON and task_source are dead weight on the list path.
+            *eager_opts(
+                load_only(
+                    Collection.id,
+                    Collection.title,
+                    Collection.description,
+                    Collection.created_by,
+                    Collection.visibility,
+                    Collection.allow_export,
+                    Collection.task_type,
+                    Collection.task_source_display,
+                    Collection.tags,
+                    Collection.created_at,
+                    Collection.updated_at,
+                ),
+                joinedload(Collection.creator).load_only(
+                    User.username, User.display_name
+                ),
+            )
+        )
+        .order_by(Collection.created_at.desc())
     )
+    if cursor is not None:
+        query = query.filter(Collection.created_at < cursor)
+    if limit is not None:
+        query = query.limit(limit)
+    collections = query.all()
+
+    if limit is not None and len(collections) == limit:
+        response.headers["X-Next-Cursor"] = collections[-1].created_at.isoformat()
+
+    stats_map = _collection_stats_bulk(db, [c.id for c in collections])
 
     result = []
     for c in collections:
-        creator = db.query(User).filter(User.id == c.created_by).first()
+        creator = c.creator
         result.append(
-            CollectionListOut(
+            CollectionListOut.model_construct(
                 id=c.id,
                 title=c.title,
                 description=c.description,
@@ -97,9 +176,11 @@ def list_collections(
                 tags=c.tags,
                 created_at=c.created_at,
                 updated_at=c.updated_at,
-                stats=_collection_stats(db, c.id),
+                stats=stats_map[c.id],
             )
         )
+    if not paginated:
+        list_cache_put(current_user.id, result)
     return result
 
 
@@ -110,8 +191,6 @@ def create_collection(
     current_user: User = Depends(get_current_user),
 ):
     cid = data.id or f"col-{uuid.uuid4().hex[:8]}"
-    if db.query(Collection).filter(Collection.id == cid).first():
-        raise HTTPException(status_code=400, detail="Collection ID already exists")
     c = Collection(
         id=cid,
         title=data.title,
@@ -125,7 +204,13 @@ def create_collection(
         tags=data.tags,
     )
     db.add(c)
-    db.commit()
+    try:
+        # The primary key already enforces uniqueness; no precheck needed
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Collection ID already exists")
+    invalidate_collection_caches()
     db.refresh(c)
     return CollectionListOut(
         id=c.id,
@@ -152,21 +237,27 @@ def get_collection(
     user_id = current_user.id if current_user else None
     if not check_collection_permission(db, user_id, collection_id, "view"):
         raise HTTPException(status_code=403, detail="No permission")
-    c = db.query(Collection).filter(Collection.id == collection_id).first()
+    c = (
+        db.query(Collection)
+        .options(*eager_opts(joinedload(Collection.creator)))
+        .filter(Collection.id == collection_id)
+        .first()
+    )
     if not c:
         raise HTTPException(status_code=404, detail="Collection not found")
 
-    creator = db.query(User).filter(User.id == c.created_by).first()
+    creator = c.creator
     perms = (
         db.query(CollectionPermission)
+        .options(*eager_opts(joinedload(CollectionPermission.user)))
         .filter(CollectionPermission.collection_id == collection_id)
         .all()
     )
     perm_out = []
     for p in perms:
-        u = db.query(User).filter(User.id == p.user_id).first()
+        u = p.user
         perm_out.append(
-            PermissionOut(
+            PermissionOut.model_construct(
                 user_id=p.user_id,
                 username=u.username if u else "unknown",
                 display_name=u.display_name if u else None,
@@ -175,26 +266,28 @@ def get_collection(
             )
         )
 
-    # Build groups
+    # Build groups; each CollectionPaper row carries its paper via the JOIN
     cps = (
         db.query(CollectionPaper)
+        .options(*eager_opts(joinedload(CollectionPaper.paper)))
         .filter(CollectionPaper.collection_id == collection_id)
         .order_by(CollectionPaper.display_order)
         .all()
     )
-    groups_map: dict[str, dict[str, list]] = {}
+    groups_map: dict[str, dict] = defaultdict(
+        lambda: {"tag": None, "sections": defaultdict(list)}
+    )
     for cp in cps:
-        paper = db.query(Paper).filter(Paper.id == cp.paper_id).first()
+        paper = cp.paper
         if not paper:
             continue
         gname = cp.group_name or "未分组"
         sname = cp.section_name or "All Papers"
-        if gname not in groups_map:
-            groups_map[gname] = {"tag": cp.group_tag, "sections": {}}
-        if sname not in groups_map[gname]["sections"]:
-            groups_map[gname]["sections"][sname] = []
-        groups_map[gname]["sections"][sname].append(
-            PaperInGroup(
+        entry = groups_map[gname]
+        if entry["tag"] is None:
+            entry["tag"] = cp.group_tag
+        entry["sections"][sname].append(
+            PaperInGroup.model_construct(
                 id=paper.id,
                 title=paper.title,
                 authors=paper.authors,
@@ -272,15 +365,14 @@ def update_collection(
 ):
     if not check_collection_permission(db, current_user.id, collection_id, "edit"):
         raise HTTPException(status_code=403, detail="No permission")
-    c = db.query(Collection).filter(Collection.id == collection_id).first()
+    c = db.get(Collection, collection_id)
     if not c:
         raise HTTPException(status_code=404, detail="Collection not found")
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(c, field, value)
-    c.updated_at = datetime.now(timezone.utc)
     db.commit()
-    db.refresh(c)
-    creator = db.query(User).filter(User.id == c.created_by).first()
+    invalidate_collection_caches()
+    creator = c.creator
     return CollectionListOut(
         id=c.id,
         title=c.title,
@@ -305,13 +397,21 @@ def delete_collection(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    c = db.query(Collection).filter(Collection.id == collection_id).first()
+    c = db.get(Collection, collection_id)
     if not c:
         raise HTTPException(status_code=404, detail="Collection not found")
     if c.created_by != current_user.id:
         raise HTTPException(status_code=403, detail="Only the creator can delete")
+    # Detach import tasks explicitly: the FK is SET NULL on fresh databases,
+    # but ones created before that change would otherwise block the delete.
+    db.execute(
+        update(ImportTask)
+        .where(ImportTask.collection_id == collection_id)
+        .values(collection_id=None)
+    )
     db.delete(c)
     db.commit()
+    invalidate_collection_caches()
 
 
 @router.put("/{collection_id}/visibility")
@@ -321,7 +421,7 @@ def update_visibility(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    c = db.query(Collection).filter(Collection.id == collection_id).first()
+    c = db.get(Collection, collection_id)
     if not c:
         raise HTTPException(status_code=404, detail="Collection not found")
     if c.created_by != current_user.id:
@@ -329,8 +429,8 @@ def update_visibility(
             status_code=403, detail="Only the creator can change visibility"
         )
     c.visibility = data.visibility
-    c.updated_at = datetime.now(timezone.utc)
     db.commit()
+    invalidate_collection_caches()
     return {"ok": True}
 
 
@@ -343,7 +443,7 @@ def add_paper_to_collection(
 ):
     if not check_collection_permission(db, current_user.id, collection_id, "edit"):
         raise HTTPException(status_code=403, detail="No permission")
-    c = db.query(Collection).filter(Collection.id == collection_id).first()
+    c = db.get(Collection, collection_id)
     if not c:
         raise HTTPException(status_code=404, detail="Collection not found")
 
@@ -374,17 +474,6 @@ def add_paper_to_collection(
             status_code=400, detail="Must provide paper_id or paper data"
         )
 
-    existing = (
-        db.query(CollectionPaper)
-        .filter(
-            CollectionPaper.collection_id == collection_id,
-            CollectionPaper.paper_id == paper_id,
-        )
-        .first()
-    )
-    if existing:
-        raise HTTPException(status_code=400, detail="Paper already in collection")
-
     cp = CollectionPaper(
         collection_id=collection_id,
         paper_id=paper_id,
@@ -394,11 +483,71 @@ def add_paper_to_collection(
         display_order=data.display_order,
     )
     db.add(cp)
+    # Touch explicitly: the onupdate hook only fires when a collection column
+    # changes, and adding a paper doesn't modify the collection row itself.
     c.updated_at = datetime.now(timezone.utc)
-    db.commit()
+    try:
+        # The (collection_id, paper_id) unique constraint catches duplicates
+        # without a precheck SELECT, and without a race window.
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Paper already in collection")
+    invalidate_collection_caches()
     return {"ok": True, "paper_id": paper_id}
 
 
+@router.post("/{collection_id}/papers/bulk", status_code=status.HTTP_201_CREATED)
+def add_papers_to_collection(
+    collection_id: str,
+    data: CollectionPaperBulkAdd,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Add many papers in one INSERT, silently skipping ones already present."""
+    if not check_collection_permission(db, current_user.id, collection_id, "edit"):
+        raise HTTPException(status_code=403, detail="No permission")
+    c = db.get(Collection, collection_id)
+    if not c:
+        raise HTTPException(status_code=404, detail="Collection not found")
+    if not data.paper_ids:
+        raise HTTPException(status_code=400, detail="No paper IDs provided")
+
+    known_ids = {
+        row[0] for row in db.query(Paper.id).filter(Paper.id.in_(data.paper_ids))
+    }
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "collection_id": collection_id,
+            "paper_id": pid,
+            "group_name": data.group_name,
+            "group_tag": data.group_tag,
+            "section_name": data.section_name,
+            "display_order": 0,
+            "added_at": now,
+        }
+        for pid in dict.fromkeys(data.paper_ids)
+        if pid in known_ids
+    ]
+
+    added: list[str] = []
+    if rows:
+        # ON CONFLICT DO NOTHING rides the (collection_id, paper_id) unique
+        # constraint, so duplicates are skipped in the same round trip.
+        stmt = (
+            sqlite_insert(CollectionPaper)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["collection_id", "paper_id"])
+            .returning(CollectionPaper.paper_id)
+        )
+        added = list(db.execute(stmt).scalars())
+        c.updated_at = now
+        db.commit()
+        invalidate_collection_caches()
+    return {"ok": True, "added": added, "skipped": len(data.paper_ids) - len(added)}
+
+
 @router.delete(
     "/{collection_id}/papers/{paper_id}", status_code=status.HTTP_204_NO_CONTENT
 )
@@ -422,6 +571,7 @@ def remove_paper_from_collection(
         raise HTTPException(status_code=404, detail="Paper not in collection")
     db.delete(cp)
     db.commit()
+    invalidate_collection_caches()
 
 
 @router.put("/{collection_id}/papers/{paper_id}")
@@ -459,17 +609,18 @@ def reorder_papers(
 ):
     if not check_collection_permission(db, current_user.id, collection_id, "edit"):
         raise HTTPException(status_code=403, detail="No permission")
-    for item in data.paper_orders:
-        cp = (
-            db.query(CollectionPaper)
-            .filter(
+    orders = {item["paper_id"]: item["display_order"] for item in data.paper_orders}
+    if orders:
+        # One CASE-based UPDATE instead of a SELECT + UPDATE per paper
+        db.execute(
+            update(CollectionPaper)
+            .where(
                 CollectionPaper.collection_id == collection_id,
-                CollectionPaper.paper_id == item["paper_id"],
+                CollectionPaper.paper_id.in_(orders),
             )
-            .first()
+            .values(display_order=case(orders, value=CollectionPaper.paper_id))
+            .execution_options(synchronize_session=False)
         )
-        if cp:
-            cp.display_order = item["display_order"]
     db.commit()
     return {"ok": True}
 
@@ -483,21 +634,22 @@ def list_permissions(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    c = db.query(Collection).filter(Collection.id == collection_id).first()
+    c = db.get(Collection, collection_id)
     if not c or c.created_by != current_user.id:
         raise HTTPException(
             status_code=403, detail="Only the creator can manage permissions"
         )
     perms = (
         db.query(CollectionPermission)
+        .options(*eager_opts(joinedload(CollectionPermission.user)))
         .filter(CollectionPermission.collection_id == collection_id)
         .all()
     )
     result = []
     for p in perms:
-        u = db.query(User).filter(User.id == p.user_id).first()
+        u = p.user
         result.append(
-            PermissionOut(
+            PermissionOut.model_construct(
                 user_id=p.user_id,
                 username=u.username if u else "unknown",
                 display_name=u.display_name if u else None,
@@ -519,7 +671,7 @@ def add_permission(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    c = db.query(Collection).filter(Collection.id == collection_id).first()
+    c = db.get(Collection, collection_id)
     if not c or c.created_by != current_user.id:
         raise HTTPException(
             status_code=403, detail="Only the creator can manage permissions"
@@ -529,8 +681,10 @@ def add_permission(
     )
     db.add(perm)
     db.commit()
+    # The grantee's list now includes this collection
+    invalidate_collection_caches()
     db.refresh(perm)
-    u = db.query(User).filter(User.id == data.user_id).first()
+    u = db.get(User, data.user_id)
     return PermissionOut(
         user_id=perm.user_id,
         username=u.username if u else "unknown",
@@ -549,7 +703,7 @@ def remove_permission(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    c = db.query(Collection).filter(Collection.id == collection_id).first()
+    c = db.get(Collection, collection_id)
     if not c or c.created_by != current_user.id:
         raise HTTPException(
             status_code=403, detail="Only the creator can manage permissions"
@@ -565,6 +719,7 @@ def remove_permission(
     if perm:
         db.delete(perm)
         db.commit()
+        invalidate_collection_caches()
 
 
 # --- Export ---
@@ -581,7 +736,7 @@ def export_collection_to_bibtex(
     if not check_collection_permission(db, user_id, collection_id, "view"):
         raise HTTPException(status_code=403, detail="No permission")
 
-    c = db.query(Collection).filter(Collection.id == collection_id).first()
+    c = db.get(Collection, collection_id)
     if not c:
         raise HTTPException(status_code=404, detail="Collection not found")
 
@@ -592,48 +747,61 @@ def export_collection_to_bibtex(
             status_code=403, detail="Export is not allowed for this collection"
         )
 
-    # Get all papers in the collection
-    cps = (
-        db.query(CollectionPaper)
-        .filter(CollectionPaper.collection_id == collection_id)
-        .all()
-    )
-    paper_ids = [cp.paper_id for cp in cps]
+    # Get all paper ids in the collection
+    paper_ids = [
+        row[0]
+        for row in db.query(CollectionPaper.paper_id).filter(
+            CollectionPaper.collection_id == collection_id
+        )
+    ]
 
     if not paper_ids:
         raise HTTPException(status_code=400, detail="Collection is empty")
 
-    papers = db.query(Paper).filter(Paper.id.in_(paper_ids)).all()
-
-    # Convert papers to dict format
-    papers_data = []
-    for paper in papers:
-        papers_data.append(
-            {
-                "title": paper.title,
-                "authors": paper.authors,
-                "venue": paper.venue,
-                "year": paper.year,
-                "abstract": paper.abstract,
-                "summary": paper.summary,
-                "status": paper.status,
-                "arxiv_id": paper.arxiv_id,
-                "doi": paper.doi,
-                "url_arxiv": paper.url_arxiv,
-                "url_pdf": paper.url_pdf,
-                "url_code": paper.url_code,
-                "url_project": paper.url_project,
-                "tags": paper.tags,
-            }
-        )
-
-    # Generate BibTeX content
-    bibtex_content = export_papers_to_bibtex(papers_data)
+    def generate_bibtex():
+        # The request session closes before a streamed body is produced, so
+        # the generator runs its own session and streams papers with yield_per
+        # instead of materializing the whole export in memory.
+        session = SessionLocal()
+        try:
+            papers = (
+                session.query(Paper).filter(Paper.id.in_(paper_ids)).yield_per(500)
+            )
+            first = True
+            for paper in papers:
+                try:
+                    entry = paper_to_bibtex_entry(
+                        {
+                            "title": paper.title,
+                            "authors": paper.authors,
+                            "venue": paper.venue,
+                            "year": paper.year,
+                            "abstract": paper.abstract,
+                            "summary": paper.summary,
+                            "status": paper.status,
+                            "arxiv_id": paper.arxiv_id,
+                            "doi": paper.doi,
+                            "url_arxiv": paper.url_arxiv,
+                            "url_pdf": paper.url_pdf,
+                            "url_code": paper.url_code,
+                            "url_project": paper.url_project,
+                            "tags": paper.tags,
+                        }
+                    )
+                except Exception as e:
+                    logger.error(f"Error exporting paper '{paper.title}': {e}")
+                    continue
+                if not first:
+                    yield "\n\n"
+                yield entry
+                first = False
+        finally:
+            session.close()
 
     # Return as downloadable file
     filename = f"{collection_id}.bib"
-    return Response(
-        content=bibtex_content,
+    return StreamingResponse(
+        generate_bibtex(),
         media_type="application/x-bibtex",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
@@ -649,7 +817,7 @@ def find_collection_duplicates(
     if not check_collection_permission(db, current_user.id, collection_id, "view"):
         raise HTTPException(status_code=403, detail="No permission")
 
-    c = db.query(Collection).filter(Collection.id == collection_id).first()
+    c = db.get(Collection, collection_id)
     if not c:
         raise HTTPException(status_code=404, detail="Collection not found")
 
@@ -666,63 +834,48 @@ def find_collection_duplicates(
 
     papers = db.query(Paper).filter(Paper.id.in_(paper_ids)).all()
 
-    # Find duplicates using multiple strategies
+    # Bucket papers by each match key in precedence order instead of comparing
+    # every pair. Titles match on the precomputed normalized_title column;
+    # rows from before the column existed fall back to normalizing here.
+    strategies = [
+        ("bibtex_key", lambda p: p.bibtex_key),
+        ("arxiv_id", lambda p: p.arxiv_id),
+        ("doi", lambda p: p.doi),
+        ("title", lambda p: p.normalized_title or normalize_title(p.title)),
+    ]
+
     duplicates = []
     seen_pairs = set()
 
-    for i, paper1 in enumerate(papers):
-        for paper2 in papers[i + 1 :]:
-            # Skip if already seen this pair
-            pair_key = tuple(sorted([paper1.id, paper2.id]))
-            if pair_key in seen_pairs:
-                continue
-
-            match_type = None
-            match_value = None
-
-            # Check BibTeX key
-            if (
-                paper1.bibtex_key
-                and paper2.bibtex_key
-                and paper1.bibtex_key == paper2.bibtex_key
-            ):
-                match_type = "bibtex_key"
-                match_value = paper1.bibtex_key
-            # Check arXiv ID
-            elif (
-                paper1.arxiv_id
-                and paper2.arxiv_id
-                and paper1.arxiv_id == paper2.arxiv_id
-            ):
-                match_type = "arxiv_id"
-                match_value = paper1.arxiv_id
-            # Check DOI
-            elif paper1.doi and paper2.doi and paper1.doi == paper2.doi:
-                match_type = "doi"
-                match_value = paper1.doi
-            # Check normalized title
-            elif normalize_title(paper1.title) == normalize_title(paper2.title):
-                match_type = "title"
-                match_value = normalize_title(paper1.title)
-
-            if match_type:
-                seen_pairs.add(pair_key)
-                duplicates.append(
-                    {
-                        "paper1_id": paper1.id,
-                        "paper1_title": paper1.title,
-                        "paper1_authors": paper1.authors,
-                        "paper1_year": paper1.year,
-                        "paper1_venue": paper1.venue,
-                        "paper2_id": paper2.id,
-                        "paper2_title": paper2.title,
-                        "paper2_authors": paper2.authors,
-                        "paper2_year": paper2.year,
-                        "paper2_venue": paper2.venue,
-                        "match_type": match_type,
-                        "match_value": match_value,
-                    }
-                )
+    for match_type, key_of in strategies:
+        buckets: dict[str, list[Paper]] = defaultdict(list)
+        for p in papers:
+            key = key_of(p)
+            if key:
+                buckets[key].append(p)
+        for match_value, group in buckets.items():
+            for i, paper1 in enumerate(group):
+                for paper2 in group[i + 1 :]:
+                    pair_key = tuple(sorted([paper1.id, paper2.id]))
+                    if pair_key in seen_pairs:
+                        continue
+                    seen_pairs.add(pair_key)
+                    duplicates.append(
+                        {
+                            "paper1_id": paper1.id,
+                            "paper1_title": paper1.title,
+                            "paper1_authors": paper1.authors,
+                            "paper1_year": paper1.year,
+                            "paper1_venue": paper1.venue,
+                            "paper2_id": paper2.id,
+                            "paper2_title": paper2.title,
+                            "paper2_authors": paper2.authors,
+                            "paper2_year": paper2.year,
+                            "paper2_venue": paper2.venue,
+                            "match_type": match_type,
+                            "match_value": match_value,
+                        }
+                    )
 
     return {"duplicates": duplicates}
 
@@ -738,24 +891,19 @@ def remove_collection_duplicates(
     if not check_collection_permission(db, current_user.id, collection_id, "edit"):
         raise HTTPException(status_code=403, detail="No permission to edit collection")
 
-    c = db.query(Collection).filter(Collection.id == collection_id).first()
+    c = db.get(Collection, collection_id)
     if not c:
         raise HTTPException(status_code=404, detail="Collection not found")
 
-    # Remove papers from collection
-    removed = 0
-    for paper_id in paper_ids:
-        cp = (
-            db.query(CollectionPaper)
-            .filter(
-                CollectionPaper.collection_id == collection_id,
-                CollectionPaper.paper_id == paper_id,
-            )
-            .first()
+    # Remove papers from collection in one indexed DELETE
+    removed = (
+        db.query(CollectionPaper)
+        .filter(
+            CollectionPaper.collection_id == collection_id,
+            CollectionPaper.paper_id.in_(paper_ids),
         )
-        if cp:
-            db.delete(cp)
-            removed += 1
-
+        .delete(synchronize_session=False)
+    )
     db.commit()
+    invalidate_collection_caches()
     return {"removed": removed}
@@ -1,10 +1,15 @@
-import asyncio
+import functools
+import hashlib
 import logging
 from datetime import datetime, timezone
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import bindparam, func, lambda_stmt, select, update
+from sqlalchemy.orm import Session, selectinload
 
 from auth.deps import get_current_user
 from database import get_db
@@ -14,87 +19,161 @@ from models.crawl_task_run import CrawlTaskRun
 from crawl.sources import get_source, list_sources
 from crawl.scheduler import scheduler, compute_next_run
 
-router = APIRouter(prefix="/api/crawl-tasks", tags=["crawl-tasks"])
+router = APIRouter(
+    prefix="/api/crawl-tasks",
+    tags=["crawl-tasks"],
+    default_response_class=ORJSONResponse,
+)
 logger = logging.getLogger(__name__)
 
 
 # --- Pydantic schemas ---
 
 
+# Closed vocabularies validated by pydantic-core at parse time (422 on bad
+# input), so handlers never see an unexpected value.
+ScheduleType = Literal["once", "daily", "weekly", "monthly"]
+TargetMode = Literal["append", "create_new"]
+DuplicateStrategy = Literal["skip", "update"]
+
+
 class CrawlTaskCreate(BaseModel):
     name: str
     source_type: str
     source_config: dict
-    schedule_type: str = "daily"
+    schedule_type: ScheduleType = "daily"
     time_range: str = "1d"
-    target_mode: str = "append"
+    target_mode: TargetMode = "append"
     target_collection_id: str | None = None
     new_collection_prefix: str | None = None
-    duplicate_strategy: str = "skip"
+    duplicate_strategy: DuplicateStrategy = "skip"
 
 
 class CrawlTaskUpdate(BaseModel):
     name: str | None = None
     source_config: dict | None = None
-    schedule_type: str | None = None
+    schedule_type: ScheduleType | None = None
     time_range: str | None = None
-    target_mode: str | None = None
+    target_mode: TargetMode | None = None
+    target_collection_id: str | None = None
+    new_collection_prefix: str | None = None
+    duplicate_strategy: DuplicateStrategy | None = None
+
+
+class CrawlTaskOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    name: str
+    source_type: str
+    source_config: dict
+    schedule_type: str
+    time_range: str
+    target_mode: str
     target_collection_id: str | None = None
     new_collection_prefix: str | None = None
-    duplicate_strategy: str | None = None
-
-
-def _task_to_dict(task: CrawlTask) -> dict:
-    return {
-        "id": task.id,
-        "name": task.name,
-        "source_type": task.source_type,
-        "source_config": task.source_config,
-        "schedule_type": task.schedule_type,
-        "time_range": task.time_range,
-        "target_mode": task.target_mode,
-        "target_collection_id": task.target_collection_id,
-        "new_collection_prefix": task.new_collection_prefix,
-        "duplicate_strategy": task.duplicate_strategy,
-        "is_enabled": task.is_enabled,
-        "last_run_at": task.last_run_at.isoformat() if task.last_run_at else None,
-        "last_run_status": task.last_run_status,
-        "last_run_result": task.last_run_result,
-        "next_run_at": task.next_run_at.isoformat() if task.next_run_at else None,
-        "created_at": task.created_at.isoformat() if task.created_at else None,
-        "updated_at": task.updated_at.isoformat() if task.updated_at else None,
-    }
+    duplicate_strategy: str
+    is_enabled: bool
+    last_run_at: datetime | None = None
+    last_run_status: str | None = None
+    last_run_result: dict | None = None
+    target_collection_name: str | None = None
+    next_run_at: datetime | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+# Hot-path statements built once; lambda_stmt caches the construct so per-
+# request work is just binding parameters (same pattern as the auth router).
+_TASKS_BY_USER = lambda_stmt(
+    lambda: select(CrawlTask)
+    .options(selectinload(CrawlTask.target_collection))
+    .where(CrawlTask.user_id == bindparam("uid"))
+    .order_by(CrawlTask.created_at.desc())
+)
+_TASK_ETAG_AGG = lambda_stmt(
+    lambda: select(func.count(), func.max(CrawlTask.updated_at)).where(
+        CrawlTask.user_id == bindparam("uid")
+    )
+)
+_RUN_ETAG_AGG = lambda_stmt(
+    lambda: select(func.count(), func.max(CrawlTaskRun.started_at)).where(
+        CrawlTaskRun.task_id == bindparam("tid")
+    )
+)
+
+
+def _etag_of(*parts) -> str:
+    """Cheap ETag over change markers (row count + latest timestamp)."""
+    raw = "|".join(str(p) for p in parts).encode()
+    return '"' + hashlib.blake2b(raw, digest_size=8).hexdigest() + '"'
 
 
 # --- Data source meta API ---
 
 
+@functools.lru_cache(maxsize=1)
+def _sources_payload() -> bytes:
+    # The catalog is process-static code configuration; serialize it once.
+    return orjson.dumps([s.to_dict() for s in list_sources()])
+
+
 @router.get("/sources", tags=["crawl-sources"])
-def get_crawl_sources():
+async def get_crawl_sources():
     """List available data sources and their config schemas"""
-    return [s.to_dict() for s in list_sources()]
+    return Response(
+        content=_sources_payload(),
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=3600"},
+    )
 
 
 # --- CRUD ---
 
 
-@router.get("")
+def request_now() -> datetime:
+    """Request-scoped clock: FastAPI caches dependency results per request,
+    so every handler in one request sees the same instant."""
+    return datetime.now(timezone.utc)
+
+
+def get_owned_task(
+    task_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> CrawlTask:
+    """Shared dependency: load the task by primary key and check ownership."""
+    task = db.get(CrawlTask, task_id)
+    if not task or task.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
+@router.get("", response_model=list[CrawlTaskOut])
 def list_crawl_tasks(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    tasks = (
-        db.query(CrawlTask)
-        .filter(CrawlTask.user_id == current_user.id)
-        .order_by(CrawlTask.created_at.desc())
-        .all()
-    )
-    return [_task_to_dict(t) for t in tasks]
+    # The frontend polls this endpoint; answer 304 from count+max(updated_at)
+    # without fetching or serializing rows when nothing changed.
+    count, latest = db.execute(_TASK_ETAG_AGG, {"uid": current_user.id}).one()
+    etag = _etag_of(count, latest)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    # Two queries total regardless of row count; task.target_collection_name
+    # reads the eagerly loaded relationship instead of lazy-loading per row.
+    tasks = db.execute(_TASKS_BY_USER, {"uid": current_user.id}).scalars().all()
+    return tasks
 
 
-@router.post("")
+@router.post("", response_model=CrawlTaskOut)
 def create_crawl_task(
     body: CrawlTaskCreate,
+    now: datetime = Depends(request_now),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -111,12 +190,11 @@ def create_crawl_task(
             raise HTTPException(
                 status_code=400, detail="target_collection_id required for append mode"
             )
-        collection = (
-            db.query(Collection)
-            .filter(Collection.id == body.target_collection_id)
-            .first()
+        # EXISTS scalar: no need to materialize the collection row
+        exists_q = db.query(Collection.id).filter(
+            Collection.id == body.target_collection_id
         )
-        if not collection:
+        if not db.query(exists_q.exists()).scalar():
             raise HTTPException(status_code=404, detail="Target collection not found")
     elif body.target_mode == "create_new":
         if not body.new_collection_prefix:
@@ -125,7 +203,6 @@ def create_crawl_task(
                 detail="new_collection_prefix required for create_new mode",
             )
 
-    now = datetime.now(timezone.utc)
     task = CrawlTask(
         user_id=current_user.id,
         name=body.name,
@@ -144,41 +221,22 @@ def create_crawl_task(
     )
     db.add(task)
     db.commit()
-    db.refresh(task)
-    return _task_to_dict(task)
+    # expire_on_commit=False keeps the flushed defaults live; no re-SELECT
+    return task
 
 
-@router.get("/{task_id}")
-def get_crawl_task(
-    task_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    task = (
-        db.query(CrawlTask)
-        .filter(CrawlTask.id == task_id, CrawlTask.user_id == current_user.id)
-        .first()
-    )
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    return _task_to_dict(task)
+@router.get("/{task_id}", response_model=CrawlTaskOut)
+def get_crawl_task(task: CrawlTask = Depends(get_owned_task)):
+    return task
 
 
-@router.put("/{task_id}")
+@router.put("/{task_id}", response_model=CrawlTaskOut)
 def update_crawl_task(
-    task_id: str,
     body: CrawlTaskUpdate,
+    now: datetime = Depends(request_now),
+    task: CrawlTask = Depends(get_owned_task),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
 ):
-    task = (
-        db.query(CrawlTask)
-        .filter(CrawlTask.id == task_id, CrawlTask.user_id == current_user.id)
-        .first()
-    )
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
     update_data = body.model_dump(exclude_none=True)
 
     # Validate source config if provided
@@ -195,38 +253,37 @@ def update_crawl_task(
     ):
         cid = update_data.get("target_collection_id", task.target_collection_id)
         if cid:
-            collection = db.query(Collection).filter(Collection.id == cid).first()
-            if not collection:
+            exists_q = db.query(Collection.id).filter(Collection.id == cid)
+            if not db.query(exists_q.exists()).scalar():
                 raise HTTPException(
                     status_code=404, detail="Target collection not found"
                 )
 
-    for key, value in update_data.items():
-        setattr(task, key, value)
-
     # Recalculate next_run_at if schedule changed
     if "schedule_type" in update_data:
-        now = datetime.now(timezone.utc)
-        task.next_run_at = compute_next_run(task.schedule_type, now)
+        update_data["next_run_at"] = compute_next_run(
+            update_data["schedule_type"], now
+        )
 
-    db.commit()
-    db.refresh(task)
-    return _task_to_dict(task)
+    if update_data:
+        # One targeted UPDATE; RETURNING folds the post-write reload into the
+        # same statement and populates the already-loaded instance.
+        task = db.execute(
+            update(CrawlTask)
+            .where(CrawlTask.id == task.id)
+            .values(**update_data)
+            .returning(CrawlTask),
+            execution_options={"populate_existing": True},
+        ).scalar_one()
+        db.commit()
+    return task
 
 
 @router.delete("/{task_id}")
 def delete_crawl_task(
-    task_id: str,
+    task: CrawlTask = Depends(get_owned_task),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
 ):
-    task = (
-        db.query(CrawlTask)
-        .filter(CrawlTask.id == task_id, CrawlTask.user_id == current_user.id)
-        .first()
-    )
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
     db.delete(task)
     db.commit()
     return {"ok": True}
@@ -235,70 +292,53 @@ def delete_crawl_task(
 # --- Task control ---
 
 
-@router.post("/{task_id}/enable")
+@router.post("/{task_id}/enable", response_model=CrawlTaskOut)
 def enable_crawl_task(
-    task_id: str,
+    now: datetime = Depends(request_now),
+    task: CrawlTask = Depends(get_owned_task),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
 ):
-    task = (
-        db.query(CrawlTask)
-        .filter(CrawlTask.id == task_id, CrawlTask.user_id == current_user.id)
-        .first()
-    )
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
+    if (
+        task.is_enabled
+        and task.schedule_type != "once"
+        and task.next_run_at
+        # Stored datetimes are naive UTC; attach the zone once and compare aware
+        and task.next_run_at.replace(tzinfo=timezone.utc) >= now
+    ):
+        # Already enabled with a valid future run: idempotent, skip the commit
+        return task
     task.is_enabled = True
-    now = datetime.now(timezone.utc)
     if task.schedule_type == "once":
         # Re-enabling a one-time task: schedule it to run now
         task.next_run_at = now
-    elif not task.next_run_at or task.next_run_at.replace(tzinfo=None) < now.replace(
-        tzinfo=None
-    ):
+    elif not task.next_run_at or task.next_run_at.replace(tzinfo=timezone.utc) < now:
         task.next_run_at = compute_next_run(task.schedule_type, now)
     db.commit()
-    return _task_to_dict(task)
+    return task
 
 
-@router.post("/{task_id}/disable")
+@router.post("/{task_id}/disable", response_model=CrawlTaskOut)
 def disable_crawl_task(
-    task_id: str,
+    task: CrawlTask = Depends(get_owned_task),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
 ):
-    task = (
-        db.query(CrawlTask)
-        .filter(CrawlTask.id == task_id, CrawlTask.user_id == current_user.id)
-        .first()
-    )
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
+    if not task.is_enabled:
+        # Idempotent double-toggle: nothing to write
+        return task
     task.is_enabled = False
     db.commit()
-    return _task_to_dict(task)
+    return task
 
 
 @router.post("/{task_id}/run-now")
-async def run_crawl_task_now(
-    task_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    task = (
-        db.query(CrawlTask)
-        .filter(CrawlTask.id == task_id, CrawlTask.user_id == current_user.id)
-        .first()
-    )
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
+async def run_crawl_task_now(task: CrawlTask = Depends(get_owned_task)):
     # Reentrancy guard: reject duplicate trigger while task is running
-    if scheduler.is_task_running(task_id):
+    if scheduler.is_task_running(task.id):
         raise HTTPException(status_code=409, detail="Task is already running")
 
-    # Run in background to not block the request
-    asyncio.create_task(scheduler.run_task_now(task_id))
+    # Run in background to not block the request; the scheduler tracks the
+    # run, logs failures and drains it on shutdown.
+    scheduler.submit_task_now(task.id)
     return {"ok": True, "message": "Task execution started"}
 
 
@@ -307,33 +347,37 @@ async def run_crawl_task_now(
 
 @router.get("/{task_id}/runs")
 def list_task_runs(
-    task_id: str,
+    request: Request,
+    response: Response,
+    before: datetime | None = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    task: CrawlTask = Depends(get_owned_task),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
 ):
-    task = (
-        db.query(CrawlTask)
-        .filter(CrawlTask.id == task_id, CrawlTask.user_id == current_user.id)
-        .first()
-    )
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    runs = (
-        db.query(CrawlTaskRun)
-        .filter(CrawlTaskRun.task_id == task_id)
-        .order_by(CrawlTaskRun.started_at.desc())
-        .limit(50)
-        .all()
-    )
+    count, latest = db.execute(_RUN_ETAG_AGG, {"tid": task.id}).one()
+    etag = _etag_of(task.id, count, latest)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    # Keyset pagination over the (task_id, started_at) index; clients page
+    # backwards by passing the X-Next-Before header value as ?before=.
+    runs_q = db.query(CrawlTaskRun).filter(CrawlTaskRun.task_id == task.id)
+    if before is not None:
+        runs_q = runs_q.filter(CrawlTaskRun.started_at < before)
+    runs = runs_q.order_by(CrawlTaskRun.started_at.desc()).limit(limit).all()
+    if len(runs) == limit:
+        response.headers["X-Next-Before"] = runs[-1].started_at.isoformat()
+    # Raw datetimes serialize to ISO-8601 in the response layer; no
+    # per-field isoformat branching needed here.
     return [
         {
             "id": r.id,
             "status": r.status,
             "result": r.result,
             "collection_id": r.collection_id,
-            "started_at": r.started_at.isoformat() if r.started_at else None,
-            "finished_at": r.finished_at.isoformat() if r.finished_at else None,
+            "started_at": r.started_at,
+            "finished_at": r.finished_at,
         }
         for r in runs
     ]
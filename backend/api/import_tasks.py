@@ -1,10 +1,14 @@
+import atexit
+import codecs
 import uuid
 import re
-import json
 import logging
-from datetime import datetime, timezone, timedelta
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
 import httpx
+import orjson
 from fastapi import (
     APIRouter,
     Depends,
@@ -12,24 +16,40 @@ from fastapi import (
     UploadFile,
     File,
     Form,
-    BackgroundTasks,
     Body,
     Request,
 )
-from sqlalchemy import func
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from auth.deps import get_current_user
 from database import get_db, SessionLocal
 from models import User, Paper, Collection, CollectionPaper, ImportTask
+from models.paper import normalize_title
 from import_module.bibtex_parser import parse_bibtex_content
-from services.deduplication import find_duplicate_paper
+from services.collection_cache import TTLStore, invalidate_collection_caches
+from services.deduplication import find_duplicate_paper, find_duplicates_bulk
 
 router = APIRouter(prefix="/api/import", tags=["import"])
 logger = logging.getLogger(__name__)
 
-# In-memory cache for scan results (expires after 30 minutes)
-_scan_cache: dict[str, dict] = {}
+# Imports run on a small dedicated pool instead of the shared request
+# threadpool, so a minute-long parse+insert job cannot starve sync route
+# handlers. Progress is polled via the ImportTask row, which each job
+# updates in its own session.
+_import_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="bibtex-import")
+atexit.register(_import_pool.shutdown)
+
+# Entries written per transaction during an import. One commit per chunk
+# bounds rollback scope for huge files and lets /tasks/{id} show progress.
+_IMPORT_CHUNK = 500
+
+# Scan results awaiting import confirmation. Single-process deployment, so an
+# in-process store stands in for an external cache; entries expire after 30
+# minutes and the store is capped so abandoned scans cannot hold every
+# uploaded file in memory (same store as the OAuth states).
+_scan_cache = TTLStore(ttl=1800, max_entries=100)
 
 # Simple backend i18n for import-related strings
 _MESSAGES = {
@@ -64,16 +84,39 @@ def _msg(lang: str, key: str) -> str:
     return _MESSAGES.get(lang, _MESSAGES["en"]).get(key, key)
 
 
-def _cleanup_expired_scans():
-    """Remove expired scan results from cache."""
-    now = datetime.now(timezone.utc)
-    expired = [
-        k
-        for k, v in _scan_cache.items()
-        if now - v["timestamp"] > timedelta(minutes=30)
-    ]
-    for k in expired:
-        del _scan_cache[k]
+async def _decode_upload(file: UploadFile) -> str:
+    """Decode an uploaded .bib file without rescanning it once per encoding.
+
+    Reads in chunks and decodes incrementally as UTF-8 (BOM-aware); only on
+    a hard UTF-8 failure are the buffered bytes retried with the legacy
+    fallback encodings. gbk is tried before latin-1 because latin-1 accepts
+    any byte sequence — in the old order it always won, leaving the gbk
+    branch dead and mojibaking Chinese files. Raises 400 when nothing fits.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    parts: list[str] = []
+    chunks: list[bytes] = []
+    utf8_ok = True
+    while chunk := await file.read(65536):
+        chunks.append(chunk)
+        if utf8_ok:
+            try:
+                parts.append(decoder.decode(chunk))
+            except UnicodeDecodeError:
+                utf8_ok = False
+    if utf8_ok:
+        try:
+            parts.append(decoder.decode(b"", final=True))
+            return "".join(parts)
+        except UnicodeDecodeError:
+            pass
+    content = b"".join(chunks)
+    for encoding in ("gbk", "latin-1"):
+        try:
+            return content.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    raise HTTPException(status_code=400, detail="Unable to decode file")
 
 
 def _process_bibtex(
@@ -84,47 +127,72 @@ def _process_bibtex(
     duplicate_strategy: str = "keep_existing",
     duplicate_decisions: dict[str, str] | None = None,
     lang: str = "en",
+    papers_data: list[dict] | None = None,
 ):
     """Background task to process BibTeX import with duplicate strategy."""
     db = SessionLocal()
     try:
-        task = db.query(ImportTask).filter(ImportTask.id == task_id).first()
-        if not task:
+        # EXISTS probe; status writes below go through targeted UPDATEs, so
+        # the task row itself never needs to be materialized.
+        task_q = db.query(ImportTask.id).filter(ImportTask.id == task_id)
+        if not db.query(task_q.exists()).scalar():
             return
 
-        papers_data = parse_bibtex_content(content)
+        if papers_data is None:
+            papers_data = parse_bibtex_content(content)
+        else:
+            # Scanned files arrive pre-parsed; copy entries because the
+            # loop below mutates them.
+            papers_data = [dict(pd) for pd in papers_data]
         total = len(papers_data)
         success = 0
         skipped = 0
         errors = []
         duplicates_merged = []
 
-        # Create collection
+        # Create collection. INSERT .. ON CONFLICT DO NOTHING RETURNING in a
+        # retry loop instead of a SELECT-then-INSERT check: two concurrent
+        # imports of the same name could both pass the check and collide on
+        # the primary key.
         slug = collection_name.lower().replace(" ", "-")[:50]
         cid = f"{slug}-{datetime.now(timezone.utc).strftime('%Y%m%d')}"
-        # Ensure unique
-        if db.query(Collection).filter(Collection.id == cid).first():
+        while True:
+            created = db.execute(
+                sqlite_insert(Collection)
+                .values(
+                    id=cid,
+                    title=collection_name,
+                    description=_msg(lang, "bib_description"),
+                    created_by=user_id,
+                    visibility="private",
+                    task_type="bib_import",
+                    task_source="user_upload",
+                    task_source_display=collection_name,
+                )
+                .on_conflict_do_nothing(index_elements=["id"])
+                .returning(Collection.id)
+            ).scalar()
+            if created:
+                break
             cid = f"{cid}-{uuid.uuid4().hex[:4]}"
 
-        collection = Collection(
-            id=cid,
-            title=collection_name,
-            description=_msg(lang, "bib_description"),
-            created_by=user_id,
-            visibility="private",
-            task_type="bib_import",
-            task_source="user_upload",
-            task_source_display=collection_name,
-        )
-        db.add(collection)
-        db.flush()
-
-        for pd in papers_data:
+        # One candidate query for the whole file instead of up to four per entry
+        dup_results = find_duplicates_bulk(db, papers_data, owner_user_id=user_id)
+
+        # Pass 1: classify entries and build row dicts; pass 2 below writes
+        # them with two bulk INSERTs instead of an add+flush per entry.
+        new_paper_rows: list[dict] = []
+        cp_rows: list[dict] = []
+        member_paper_ids: set[str] = set()
+        # Loop-invariant strings resolved once, not per entry
+        msgs = _MESSAGES.get(lang, _MESSAGES["en"])
+        group_imported = msgs.get("group_imported", "group_imported")
+
+        for idx, (pd, (existing, dup_info)) in enumerate(
+            zip(papers_data, dup_results), start=1
+        ):
             entry_id = pd.pop("_entry_id", "unknown")
             try:
-                # Use collection owner for scoped deduplication
-                existing, dup_info = find_duplicate_paper(db, pd, owner_user_id=user_id)
-
                 if existing and dup_info:
                     # Determine action based on strategy
                     if duplicate_strategy == "manual":
@@ -143,69 +211,127 @@ def _process_bibtex(
                         )
                         continue
                     elif decision == "use_new":
-                        # Update existing paper with new data
+                        # Update existing paper with new data. For a match
+                        # against an earlier entry in this file the row is
+                        # still pending, so mutate its dict instead.
+                        pending = getattr(existing, "_pending_row", None)
                         for key, value in pd.items():
                             if value is not None:  # Only update non-null fields
-                                setattr(existing, key, value)
-                        paper = existing
-                    else:  # keep_existing
-                        paper = existing
-
-                    duplicates_merged.append(dup_info.dict())
+                                if pending is not None:
+                                    pending[key] = value
+                                else:
+                                    setattr(existing, key, value)
+                        if pending is not None:
+                            pending["normalized_title"] = normalize_title(
+                                pending["title"]
+                            )
+                            if pending.get("doi"):
+                                pending["doi"] = pending["doi"].lower()
+
+                    duplicates_merged.append(dup_info)
+                    paper_id = existing.id
                 else:
-                    # No duplicate found, create new paper
-                    paper = Paper(**pd)
-                    db.add(paper)
-                    db.flush()
-
-                # Add to collection
-                cp_exists = (
-                    db.query(CollectionPaper)
-                    .filter(
-                        CollectionPaper.collection_id == cid,
-                        CollectionPaper.paper_id == paper.id,
-                    )
-                    .first()
-                )
-                if not cp_exists:
-                    cp = CollectionPaper(
-                        collection_id=cid,
-                        paper_id=paper.id,
-                        group_name=_msg(lang, "group_imported"),
-                        group_tag="imported",
-                        section_name="All Papers",
-                        display_order=success,
+                    # No duplicate found: queue a new row under the id that
+                    # find_duplicates_bulk assigned (in-batch matches already
+                    # reference it). Core inserts bypass the ORM validates
+                    # hook, so fill the derived column here.
+                    pd.setdefault("id", str(uuid.uuid4()))
+                    pd["normalized_title"] = normalize_title(pd["title"])
+                    if pd.get("doi"):
+                        pd["doi"] = pd["doi"].lower()
+                    new_paper_rows.append(pd)
+                    paper_id = pd["id"]
+
+                # The collection was just created, so only within-file repeats
+                # can already be members.
+                if paper_id not in member_paper_ids:
+                    member_paper_ids.add(paper_id)
+                    cp_rows.append(
+                        {
+                            "collection_id": cid,
+                            "paper_id": paper_id,
+                            "group_name": group_imported,
+                            "group_tag": "imported",
+                            "section_name": "All Papers",
+                            "display_order": success,
+                        }
                     )
-                    db.add(cp)
                 success += 1
             except Exception as e:
                 logger.error(f"Error importing entry {entry_id}: {e}")
                 errors.append({"entry_id": entry_id, "reason": str(e)})
                 skipped += 1
 
-        task.status = "completed"
-        task.collection_id = cid
-        task.result = {
-            "collection_id": cid,
-            "progress": {
-                "total": total,
-                "processed": total,
-                "success": success,
-                "skipped": skipped,
-            },
-            "errors": errors,
-            "duplicates": duplicates_merged,
-        }
-        task.completed_at = datetime.now(timezone.utc)
+            if idx % _IMPORT_CHUNK == 0 and idx < total:
+                # Flush and commit this chunk in its own transaction
+                if new_paper_rows:
+                    db.execute(insert(Paper), new_paper_rows)
+                    new_paper_rows = []
+                if cp_rows:
+                    db.execute(insert(CollectionPaper), cp_rows)
+                    cp_rows = []
+                db.execute(
+                    update(ImportTask)
+                    .where(ImportTask.id == task_id)
+                    .values(
+                        collection_id=cid,
+                        result={
+                            "collection_id": cid,
+                            "progress": {
+                                "total": total,
+                                "processed": idx,
+                                "success": success,
+                                "skipped": skipped,
+                            },
+                        },
+                    )
+                )
+                db.commit()
+
+        # Final chunk: two round-trips regardless of size (insertmanyvalues)
+        if new_paper_rows:
+            db.execute(insert(Paper), new_paper_rows)
+        if cp_rows:
+            db.execute(insert(CollectionPaper), cp_rows)
+
+        db.execute(
+            update(ImportTask)
+            .where(ImportTask.id == task_id)
+            .values(
+                status="completed",
+                collection_id=cid,
+                result={
+                    "collection_id": cid,
+                    "progress": {
+                        "total": total,
+                        "processed": total,
+                        "success": success,
+                        "skipped": skipped,
+                    },
+                    "errors": errors,
+                    # Serialized once here instead of per entry in the loop
+                    "duplicates": [d.dict() for d in duplicates_merged],
+                },
+                completed_at=datetime.now(timezone.utc),
+            )
+        )
         db.commit()
+        # The new collection (and its paper counts) must show up in lists
+        invalidate_collection_caches()
     except Exception as e:
         logger.error(f"Import task {task_id} failed: {e}")
-        task = db.query(ImportTask).filter(ImportTask.id == task_id).first()
-        if task:
-            task.status = "failed"
-            task.result = {"error": str(e)}
-            task.completed_at = datetime.now(timezone.utc)
-            db.commit()
+        # Drop whatever the failed transaction held before recording failure
+        db.rollback()
+        db.execute(
+            update(ImportTask)
+            .where(ImportTask.id == task_id)
+            .values(
+                status="failed",
+                result={"error": str(e)},
+                completed_at=datetime.now(timezone.utc),
+            )
+        )
+        db.commit()
     finally:
         db.close()
 
@@ -219,12 +345,15 @@ def _process_bibtex_append(
     skip_collection_duplicates: bool = True,
     duplicate_decisions: dict[str, str] | None = None,
     lang: str = "en",
+    papers_data: list[dict] | None = None,
 ):
     """Background task to append BibTeX papers to an existing collection with strategy-based dedup control."""
     db = SessionLocal()
     try:
-        task = db.query(ImportTask).filter(ImportTask.id == task_id).first()
-        if not task:
+        # EXISTS probe; status writes below go through targeted UPDATEs, so
+        # the task row itself never needs to be materialized.
+        task_q = db.query(ImportTask.id).filter(ImportTask.id == task_id)
+        if not db.query(task_q.exists()).scalar():
             return
 
         # Get collection to determine owner
@@ -233,28 +362,46 @@ def _process_bibtex_append(
             raise ValueError(f"Collection {collection_id} not found")
         owner_user_id = collection.created_by
 
-        papers_data = parse_bibtex_content(content)
+        if papers_data is None:
+            papers_data = parse_bibtex_content(content)
+        else:
+            # Scanned files arrive pre-parsed; copy entries because the
+            # loop below mutates them.
+            papers_data = [dict(pd) for pd in papers_data]
         total = len(papers_data)
         success = 0
         skipped = 0
         errors = []
         duplicates_merged = []
 
-        max_order = (
-            db.query(func.max(CollectionPaper.display_order))
-            .filter(CollectionPaper.collection_id == collection_id)
-            .scalar()
-            or 0
+        # One candidate query for the whole file instead of up to four per entry
+        dup_results = find_duplicates_bulk(db, papers_data, owner_user_id=owner_user_id)
+
+        # Pass 1: classify entries and build row dicts; pass 2 below writes
+        # them with two bulk INSERTs instead of an add+flush per entry.
+        new_paper_rows: list[dict] = []
+        cp_rows: list[dict] = []
+        # One query supplies both the membership set for the per-entry guard
+        # and the current top display_order.
+        membership_rows = db.execute(
+            select(CollectionPaper.paper_id, CollectionPaper.display_order).where(
+                CollectionPaper.collection_id == collection_id
+            )
+        ).all()
+        member_paper_ids: set[str] = {row.paper_id for row in membership_rows}
+        max_order = max((row.display_order for row in membership_rows), default=0)
+        # Loop-invariant strings resolved once, not per entry
+        msgs = _MESSAGES.get(lang, _MESSAGES["en"])
+        group_imported = msgs.get("group_imported", "group_imported")
+        already_in_collection = msgs.get(
+            "already_in_collection", "already_in_collection"
         )
 
-        for pd in papers_data:
+        for idx, (pd, (existing, dup_info)) in enumerate(
+            zip(papers_data, dup_results), start=1
+        ):
             entry_id = pd.pop("_entry_id", "unknown")
             try:
-                # Use collection owner for scoped deduplication
-                existing, dup_info = find_duplicate_paper(
-                    db, pd, owner_user_id=owner_user_id
-                )
-
                 if existing and dup_info:
                     # Determine action based on strategy
                     if duplicate_strategy == "manual":
@@ -271,78 +418,135 @@ def _process_bibtex_append(
                         )
                         continue
                     elif decision == "use_new":
+                        # In-batch matches point at a still-pending row; mutate
+                        # its dict, a setattr on the transient object is lost.
+                        pending = getattr(existing, "_pending_row", None)
                         for key, value in pd.items():
                             if value is not None:
-                                setattr(existing, key, value)
-                        paper = existing
-                    else:  # keep_existing
-                        paper = existing
-
-                    duplicates_merged.append(dup_info.dict())
+                                if pending is not None:
+                                    pending[key] = value
+                                else:
+                                    setattr(existing, key, value)
+                        if pending is not None:
+                            pending["normalized_title"] = normalize_title(
+                                pending["title"]
+                            )
+                            if pending.get("doi"):
+                                pending["doi"] = pending["doi"].lower()
+
+                    duplicates_merged.append(dup_info)
+                    paper_id = existing.id
+                    in_collection = paper_id in member_paper_ids
                 else:
-                    paper = Paper(**pd)
-                    db.add(paper)
-                    db.flush()
-
-                # Check if already in collection
-                cp_exists = (
-                    db.query(CollectionPaper)
-                    .filter(
-                        CollectionPaper.collection_id == collection_id,
-                        CollectionPaper.paper_id == paper.id,
+                    # No duplicate found: queue a new row under the id that
+                    # find_duplicates_bulk assigned. Core inserts bypass the
+                    # ORM validates hook, so fill the derived column here.
+                    pd.setdefault("id", str(uuid.uuid4()))
+                    pd["normalized_title"] = normalize_title(pd["title"])
+                    if pd.get("doi"):
+                        pd["doi"] = pd["doi"].lower()
+                    new_paper_rows.append(pd)
+                    paper_id = pd["id"]
+                    in_collection = False
+
+                if in_collection and skip_collection_duplicates:
+                    skipped += 1
+                    errors.append(
+                        {
+                            "entry_id": entry_id,
+                            "reason": already_in_collection,
+                        }
                     )
-                    .first()
-                )
-                if cp_exists:
-                    if skip_collection_duplicates:
-                        skipped += 1
-                        errors.append(
-                            {
-                                "entry_id": entry_id,
-                                "reason": _msg(lang, "already_in_collection"),
-                            }
-                        )
-                        continue
+                    continue
 
                 max_order += 1
-                cp = CollectionPaper(
-                    collection_id=collection_id,
-                    paper_id=paper.id,
-                    group_name=_msg(lang, "group_imported"),
-                    group_tag="imported",
-                    section_name="All Papers",
-                    display_order=max_order,
+                member_paper_ids.add(paper_id)
+                cp_rows.append(
+                    {
+                        "collection_id": collection_id,
+                        "paper_id": paper_id,
+                        "group_name": _msg(lang, "group_imported"),
+                        "group_tag": "imported",
+                        "section_name": "All Papers",
+                        "display_order": max_order,
+                    }
                 )
-                db.add(cp)
                 success += 1
             except Exception as e:
                 logger.error(f"Error importing entry {entry_id}: {e}")
                 errors.append({"entry_id": entry_id, "reason": str(e)})
                 skipped += 1
 
-        task.status = "completed"
-        task.collection_id = collection_id
-        task.result = {
-            "collection_id": collection_id,
-            "progress": {
-                "total": total,
-                "processed": total,
-                "success": success,
-                "skipped": skipped,
-            },
-            "errors": errors,
-            "duplicates": duplicates_merged,
-        }
-        task.completed_at = datetime.now(timezone.utc)
+            if idx % _IMPORT_CHUNK == 0 and idx < total:
+                # Flush and commit this chunk in its own transaction
+                if new_paper_rows:
+                    db.execute(insert(Paper), new_paper_rows)
+                    new_paper_rows = []
+                if cp_rows:
+                    db.execute(insert(CollectionPaper), cp_rows)
+                    cp_rows = []
+                db.execute(
+                    update(ImportTask)
+                    .where(ImportTask.id == task_id)
+                    .values(
+                        collection_id=collection_id,
+                        result={
+                            "collection_id": collection_id,
+                            "progress": {
+                                "total": total,
+                                "processed": idx,
+                                "success": success,
+                                "skipped": skipped,
+                            },
+                        },
+                    )
+                )
+                db.commit()
+
+        # Final chunk: two round-trips regardless of size (insertmanyvalues)
+        if new_paper_rows:
+            db.execute(insert(Paper), new_paper_rows)
+        if cp_rows:
+            db.execute(insert(CollectionPaper), cp_rows)
+
+        db.execute(
+            update(ImportTask)
+            .where(ImportTask.id == task_id)
+            .values(
+                status="completed",
+                collection_id=collection_id,
+                result={
+                    "collection_id": collection_id,
+                    "progress": {
+                        "total": total,
+                        "processed": total,
+                        "success": success,
+                        "skipped": skipped,
+                    },
+                    "errors": errors,
+                    # Serialized once here instead of per entry in the loop
+                    "duplicates": [d.dict() for d in duplicates_merged],
+                },
+                completed_at=datetime.now(timezone.utc),
+            )
+        )
         db.commit()
+        # Cached lists carry per-collection paper counts
+        invalidate_collection_caches()
     except Exception as e:
         logger.error(f"Import append task {task_id} failed: {e}")
-        task = db.query(ImportTask).filter(ImportTask.id == task_id).first()
-        if task:
-            task.status = "failed"
-            task.result = {"error": str(e)}
-            task.completed_at = datetime.now(timezone.utc)
-            db.commit()
+        # Drop whatever the failed transaction held before recording failure
+        db.rollback()
+        db.execute(
+            update(ImportTask)
+            .where(ImportTask.id == task_id)
+            .values(
+                status="failed",
+                result={"error": str(e)},
+                completed_at=datetime.now(timezone.utc),
+            )
+        )
+        db.commit()
     finally:
         db.close()
 
@@ -363,16 +567,7 @@ async def scan_bibtex_for_duplicates(
     if not file.filename or not file.filename.endswith(".bib"):
         raise HTTPException(status_code=400, detail="Only .bib files are accepted")
 
-    content = await file.read()
-    text = None
-    for encoding in ("utf-8", "latin-1", "gbk"):
-        try:
-            text = content.decode(encoding)
-            break
-        except UnicodeDecodeError:
-            continue
-    if text is None:
-        raise HTTPException(status_code=400, detail="Unable to decode file")
+    text = await _decode_upload(file)
 
     # Determine owner for scoped deduplication
     owner_user_id = current_user.id
@@ -382,21 +577,23 @@ async def scan_bibtex_for_duplicates(
             owner_user_id = collection.created_by
 
     papers_data = parse_bibtex_content(text)
-    duplicates: list[dict] = []
-
-    for pd in papers_data:
-        existing, dup_info = find_duplicate_paper(db, pd, owner_user_id=owner_user_id)
-        if existing and dup_info:
-            duplicates.append(dup_info.dict())
+    # One owner-scoped candidate query plus in-memory dict probes, instead
+    # of up to four SELECTs per entry.
+    duplicates: list[dict] = [
+        dup_info.dict()
+        for _existing, dup_info in find_duplicates_bulk(
+            db, papers_data, owner_user_id=owner_user_id
+        )
+        if dup_info
+    ]
 
     # Store in cache
     scan_id = str(uuid.uuid4())
-    _cleanup_expired_scans()
-    _scan_cache[scan_id] = {
-        "content": text,
-        "timestamp": datetime.now(timezone.utc),
-        "duplicates": duplicates,
-    }
+    # Keep the parsed entries so a follow-up import skips the second parse
+    _scan_cache.put(
+        scan_id,
+        {"content": text, "duplicates": duplicates, "papers_data": papers_data},
+    )
 
     return {
         "scan_id": scan_id,
@@ -409,7 +606,6 @@ async def scan_bibtex_for_duplicates(
 @router.post("/bibtex")
 async def import_bibtex(
     request: Request,
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(None),
     collection_name: str = Form(None),
     scan_id: str = Form(None),
@@ -420,10 +616,13 @@ async def import_bibtex(
     current_user: User = Depends(get_current_user),
 ):
     # Get content from file or scan cache
+    pre_parsed = None
     if scan_id:
-        if scan_id not in _scan_cache:
+        scan = _scan_cache.get(scan_id)
+        if scan is None:
             raise HTTPException(status_code=404, detail="Scan expired or not found")
-        text = _scan_cache[scan_id]["content"]
+        text = scan["content"]
+        pre_parsed = scan.get("papers_data")
         # Extract filename from scan if available
         if not collection_name:
             collection_name = "Imported Collection"
@@ -433,16 +632,7 @@ async def import_bibtex(
         if not file.filename or not file.filename.endswith(".bib"):
             raise HTTPException(status_code=400, detail="Only .bib files are accepted")
 
-        content = await file.read()
-        text = None
-        for encoding in ("utf-8", "latin-1", "gbk"):
-            try:
-                text = content.decode(encoding)
-                break
-            except UnicodeDecodeError:
-                continue
-        if text is None:
-            raise HTTPException(status_code=400, detail="Unable to decode file")
+        text = await _decode_upload(file)
 
         if not collection_name:
             collection_name = (
@@ -456,7 +646,7 @@ async def import_bibtex(
     if skip_dedup is not None:
         duplicate_strategy = "use_new" if skip_dedup else "keep_existing"
 
-    decisions = json.loads(duplicate_decisions) if duplicate_decisions else None
+    decisions = orjson.loads(duplicate_decisions) if duplicate_decisions else None
 
     task_id = str(uuid.uuid4())
     task = ImportTask(
@@ -468,7 +658,7 @@ async def import_bibtex(
     db.add(task)
     db.commit()
 
-    background_tasks.add_task(
+    _import_pool.submit(
         _process_bibtex,
         task_id,
         text,
@@ -477,6 +667,7 @@ async def import_bibtex(
         duplicate_strategy,
         decisions,
         _get_lang(request.headers.get("accept-language")),
+        papers_data=pre_parsed,
     )
     return {"task_id": task_id, "status": "processing", "message": "Import started"}
 
@@ -485,7 +676,6 @@ async def import_bibtex(
 async def import_bibtex_to_collection(
     collection_id: str,
     request: Request,
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(None),
     scan_id: str = Form(None),
     duplicate_strategy: str = Form("keep_existing"),
@@ -504,32 +694,26 @@ async def import_bibtex_to_collection(
         raise HTTPException(status_code=404, detail="Collection not found")
 
     # Get content from file or scan cache
+    pre_parsed = None
     if scan_id:
-        if scan_id not in _scan_cache:
+        scan = _scan_cache.get(scan_id)
+        if scan is None:
             raise HTTPException(status_code=404, detail="Scan expired or not found")
-        text = _scan_cache[scan_id]["content"]
+        text = scan["content"]
+        pre_parsed = scan.get("papers_data")
     else:
         if not file:
             raise HTTPException(status_code=400, detail="File or scan_id required")
         if not file.filename or not file.filename.endswith(".bib"):
             raise HTTPException(status_code=400, detail="Only .bib files are accepted")
 
-        content = await file.read()
-        text = None
-        for encoding in ("utf-8", "latin-1", "gbk"):
-            try:
-                text = content.decode(encoding)
-                break
-            except UnicodeDecodeError:
-                continue
-        if text is None:
-            raise HTTPException(status_code=400, detail="Unable to decode file")
+        text = await _decode_upload(file)
 
     # Backward compatibility
     if skip_dedup is not None:
         duplicate_strategy = "use_new" if skip_dedup else "keep_existing"
 
-    decisions = json.loads(duplicate_decisions) if duplicate_decisions else None
+    decisions = orjson.loads(duplicate_decisions) if duplicate_decisions else None
 
     task_id = str(uuid.uuid4())
     task = ImportTask(
@@ -541,7 +725,7 @@ async def import_bibtex_to_collection(
     db.add(task)
     db.commit()
 
-    background_tasks.add_task(
+    _import_pool.submit(
         _process_bibtex_append,
         task_id,
         text,
@@ -551,62 +735,54 @@ async def import_bibtex_to_collection(
         skip_collection_duplicates,
         decisions,
         _get_lang(request.headers.get("accept-language")),
+        papers_data=pre_parsed,
     )
     return {"task_id": task_id, "status": "processing", "message": "Import started"}
 
 
+# New-style ids (2301.12345, optionally versioned) and old-style ones
+# (cs/0601001), with or without an arxiv.org/abs|pdf|html prefix.
+_ARXIV_ID_RE = re.compile(
+    r"(?:arxiv\.org/(?:abs|pdf|html)/)?(\d{4}\.\d{4,5}(?:v\d+)?|[a-z-]+/\d{7}(?:v\d+)?)"
+)
+
+
 def _parse_arxiv_id(url: str) -> str | None:
     """Extract arXiv ID from various URL formats."""
-    # https://arxiv.org/abs/2301.12345
-    # https://arxiv.org/pdf/2301.12345
-    # https://arxiv.org/abs/2301.12345v2
-    # 2301.12345
-    m = re.search(r"(?:arxiv\.org/(?:abs|pdf|html)/)?(\d{4}\.\d{4,5}(?:v\d+)?)", url)
-    if m:
-        return m.group(1)
-    # Old format: arxiv.org/abs/cs/0601001
-    m = re.search(r"(?:arxiv\.org/(?:abs|pdf)/)?([a-z-]+/\d{7}(?:v\d+)?)", url)
-    if m:
-        return m.group(1)
-    return None
+    m = _ARXIV_ID_RE.search(url)
+    return m.group(1) if m else None
 
 
-async def _fetch_arxiv_metadata(arxiv_id: str) -> dict:
-    """Fetch paper metadata from arXiv API."""
-    import asyncio
-
-    api_url = f"https://export.arxiv.org/api/query?id_list={arxiv_id}"
-    headers = {"User-Agent": "share-bib/1.0 (https://github.com/visualDust/share-bib)"}
-    async with httpx.AsyncClient(timeout=30) as http:
-        for attempt in range(3):
-            resp = await http.get(api_url, headers=headers)
-            if resp.status_code == 429:
-                await asyncio.sleep(3 * (attempt + 1))
-                continue
-            resp.raise_for_status()
-            break
-        else:
-            resp.raise_for_status()
+# One shared client for arXiv calls, so repeated fetches reuse the pooled
+# connection instead of paying TLS setup per request (async counterpart of
+# the module-level client in api/auth.py). Closed on app shutdown.
+_arxiv_http = httpx.AsyncClient(
+    timeout=30,
+    headers={"User-Agent": "share-bib/1.0 (https://github.com/visualDust/share-bib)"},
+)
 
-    import xml.etree.ElementTree as ET
+_ARXIV_NS = {
+    "atom": "http://www.w3.org/2005/Atom",
+    "arxiv": "http://arxiv.org/schemas/atom",
+}
 
-    ns = {
-        "atom": "http://www.w3.org/2005/Atom",
-        "arxiv": "http://arxiv.org/schemas/atom",
-    }
-    root = ET.fromstring(resp.text)
-    entry = root.find("atom:entry", ns)
-    if entry is None:
-        raise ValueError("Paper not found on arXiv")
 
-    # Check for error
-    id_el = entry.find("atom:id", ns)
-    if id_el is not None and "error" in (id_el.text or "").lower():
-        raise ValueError("Paper not found on arXiv")
+def _parse_arxiv_entry(entry: ET.Element) -> dict | None:
+    """Convert one Atom entry into a paper dict; None for error entries."""
+    ns = _ARXIV_NS
+    id_text = entry.findtext("atom:id", "", ns) or ""
+    if "error" in id_text.lower():
+        return None
 
     title = (entry.findtext("atom:title", "", ns) or "").strip().replace("\n", " ")
     if not title:
-        raise ValueError("Paper not found on arXiv")
+        return None
+
+    # Canonical versionless id, recovered from the entry itself
+    raw_id = _parse_arxiv_id(id_text) or ""
+    clean_id = re.sub(r"v\d+$", "", raw_id)
+    if not clean_id:
+        return None
 
     abstract = (entry.findtext("atom:summary", "", ns) or "").strip().replace("\n", " ")
     authors = [
@@ -625,9 +801,6 @@ async def _fetch_arxiv_metadata(arxiv_id: str) -> dict:
     doi_el = entry.find("arxiv:doi", ns)
     doi = doi_el.text if doi_el is not None else None
 
-    # Strip version from arxiv_id for canonical form
-    clean_id = re.sub(r"v\d+$", "", arxiv_id)
-
     return {
         "title": title,
         "authors": authors,
@@ -642,6 +815,46 @@ async def _fetch_arxiv_metadata(arxiv_id: str) -> dict:
     }
 
 
+async def _fetch_arxiv_metadata_bulk(arxiv_ids: list[str]) -> dict[str, dict]:
+    """Fetch metadata for up to 100 papers with one arXiv API call.
+
+    Returns {versionless arxiv_id: paper dict}; ids unknown to arXiv are
+    simply absent from the result.
+    """
+    import asyncio
+
+    api_url = "https://export.arxiv.org/api/query"
+    params = {"id_list": ",".join(arxiv_ids[:100]), "max_results": 100}
+    for attempt in range(3):
+        resp = await _arxiv_http.get(api_url, params=params)
+        if resp.status_code == 429:
+            await asyncio.sleep(3 * (attempt + 1))
+            continue
+        resp.raise_for_status()
+        break
+    else:
+        resp.raise_for_status()
+
+    # Feed bytes straight to expat; it honors the XML declaration, so there
+    # is no need to decode the body to str first.
+    root = ET.fromstring(resp.content)
+    results: dict[str, dict] = {}
+    for entry in root.findall("atom:entry", _ARXIV_NS):
+        meta = _parse_arxiv_entry(entry)
+        if meta:
+            results[meta["arxiv_id"]] = meta
+    return results
+
+
+async def _fetch_arxiv_metadata(arxiv_id: str) -> dict:
+    """Fetch paper metadata from arXiv API."""
+    metas = await _fetch_arxiv_metadata_bulk([arxiv_id])
+    meta = metas.get(re.sub(r"v\d+$", "", arxiv_id))
+    if meta is None:
+        raise ValueError("Paper not found on arXiv")
+    return meta
+
+
 @router.post("/arxiv/{collection_id}")
 async def import_arxiv_to_collection(
     collection_id: str,
@@ -719,10 +932,130 @@ async def import_arxiv_to_collection(
     )
     db.add(cp)
     db.commit()
+    invalidate_collection_caches()
 
     return {"ok": True, "paper_id": paper.id, "title": meta["title"], "skipped": False}
 
 
+@router.post("/arxiv/batch/{collection_id}")
+async def import_arxiv_batch_to_collection(
+    collection_id: str,
+    request: Request,
+    body: dict = Body(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Import several arXiv papers with a single arXiv API round-trip."""
+    from services.permission_service import check_collection_permission
+
+    if not check_collection_permission(db, current_user.id, collection_id, "edit"):
+        raise HTTPException(status_code=403, detail="No permission")
+    c = db.query(Collection).filter(Collection.id == collection_id).first()
+    if not c:
+        raise HTTPException(status_code=404, detail="Collection not found")
+
+    urls = body.get("urls") or []
+    if not urls:
+        raise HTTPException(status_code=400, detail="urls is required")
+    if len(urls) > 100:
+        raise HTTPException(status_code=400, detail="At most 100 URLs per batch")
+
+    lang = _get_lang(request.headers.get("accept-language"))
+
+    errors = []
+    clean_ids: list[str] = []
+    seen_ids: set[str] = set()
+    for url in urls:
+        arxiv_id = _parse_arxiv_id(str(url).strip())
+        if not arxiv_id:
+            errors.append({"url": url, "reason": _msg(lang, "cannot_parse_arxiv")})
+            continue
+        clean_id = re.sub(r"v\d+$", "", arxiv_id)
+        if clean_id not in seen_ids:
+            seen_ids.add(clean_id)
+            clean_ids.append(clean_id)
+
+    metas: dict[str, dict] = {}
+    if clean_ids:
+        try:
+            metas = await _fetch_arxiv_metadata_bulk(clean_ids)
+        except Exception as e:
+            raise HTTPException(
+                status_code=400, detail=f"{_msg(lang, 'fetch_arxiv_failed')}: {e}"
+            )
+
+    papers_data = []
+    for clean_id in clean_ids:
+        meta = metas.get(clean_id)
+        if meta is None:
+            errors.append({"arxiv_id": clean_id, "reason": "Paper not found on arXiv"})
+        else:
+            papers_data.append(meta)
+
+    # Same bulk write scheme as the BibTeX import: one dedup query, one
+    # membership preload, then two INSERTs.
+    dup_results = find_duplicates_bulk(db, papers_data, owner_user_id=c.created_by)
+    membership_rows = db.execute(
+        select(CollectionPaper.paper_id, CollectionPaper.display_order).where(
+            CollectionPaper.collection_id == collection_id
+        )
+    ).all()
+    member_paper_ids: set[str] = {row.paper_id for row in membership_rows}
+    max_order = max((row.display_order for row in membership_rows), default=0)
+
+    added = 0
+    skipped = 0
+    new_paper_rows: list[dict] = []
+    cp_rows: list[dict] = []
+    for meta, (existing, _dup_info) in zip(papers_data, dup_results):
+        if existing:
+            paper_id = existing.id
+        else:
+            meta.setdefault("id", str(uuid.uuid4()))
+            meta["normalized_title"] = normalize_title(meta["title"])
+            if meta.get("doi"):
+                meta["doi"] = meta["doi"].lower()
+            new_paper_rows.append(meta)
+            paper_id = meta["id"]
+        if paper_id in member_paper_ids:
+            skipped += 1
+            errors.append(
+                {
+                    "arxiv_id": meta["arxiv_id"],
+                    "reason": _msg(lang, "paper_already_in_collection"),
+                }
+            )
+            continue
+        member_paper_ids.add(paper_id)
+        max_order += 1
+        cp_rows.append(
+            {
+                "collection_id": collection_id,
+                "paper_id": paper_id,
+                "group_name": _msg(lang, "group_arxiv"),
+                "group_tag": "arxiv",
+                "section_name": "All Papers",
+                "display_order": max_order,
+            }
+        )
+        added += 1
+
+    if new_paper_rows:
+        db.execute(insert(Paper), new_paper_rows)
+    if cp_rows:
+        db.execute(insert(CollectionPaper), cp_rows)
+    db.commit()
+    invalidate_collection_caches()
+
+    return {
+        "ok": True,
+        "total": len(urls),
+        "added": added,
+        "skipped": skipped,
+        "errors": errors,
+    }
+
+
 @router.get("/tasks")
 def list_import_tasks(
     db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
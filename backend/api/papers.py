@@ -1,5 +1,9 @@
+from datetime import datetime, timezone
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from auth.deps import get_current_user
@@ -7,6 +11,8 @@ from database import get_db
 from models import User, Paper, CollectionPaper, UserPaperMeta
 from schemas import PaperCreate, PaperUpdate, PaperOut
 from schemas.user_paper_meta import UserPaperMetaOut, UserPaperMetaUpdate
+from services.collection_cache import invalidate_collection_caches
+from services.search import apply_fts, match_expression
 
 router = APIRouter(prefix="/api/papers", tags=["papers"])
 
@@ -22,15 +28,23 @@ def list_papers(
     current_user: User = Depends(get_current_user),
 ):
     query = db.query(Paper)
+    rank = None
     if q:
-        query = query.filter(
-            or_(Paper.title.ilike(f"%{q}%"), Paper.abstract.ilike(f"%{q}%"))
-        )
+        # FTS index lookup instead of a leading-wildcard ILIKE table scan;
+        # falls back to ILIKE for single-character queries or without FTS5.
+        match = match_expression(q)
+        if match:
+            query, rank = apply_fts(query, match)
+        else:
+            query = query.filter(
+                or_(Paper.title.ilike(f"%{q}%"), Paper.abstract.ilike(f"%{q}%"))
+            )
     if year:
         query = query.filter(Paper.year == year)
     if status_filter:
         query = query.filter(Paper.status == status_filter)
-    return query.order_by(Paper.created_at.desc()).offset(offset).limit(limit).all()
+    order = rank if rank is not None else Paper.created_at.desc()
+    return query.order_by(order).offset(offset).limit(limit).all()
 
 
 @router.post("", response_model=PaperOut, status_code=status.HTTP_201_CREATED)
@@ -53,12 +67,16 @@ def search_papers(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return (
-        db.query(Paper)
-        .filter(or_(Paper.title.ilike(f"%{q}%"), Paper.abstract.ilike(f"%{q}%")))
-        .limit(limit)
-        .all()
-    )
+    query = db.query(Paper)
+    match = match_expression(q)
+    if match:
+        query, rank = apply_fts(query, match)
+        query = query.order_by(rank)
+    else:
+        query = query.filter(
+            or_(Paper.title.ilike(f"%{q}%"), Paper.abstract.ilike(f"%{q}%"))
+        )
+    return query.limit(limit).all()
 
 
 @router.get("/by-arxiv/{arxiv_id}", response_model=PaperOut)
@@ -98,6 +116,8 @@ def update_paper(
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(paper, field, value)
     db.commit()
+    # Status edits feed the accessible/no_access stats in cached lists
+    invalidate_collection_caches()
     db.refresh(paper)
     return paper
 
@@ -111,15 +131,30 @@ def delete_paper(
     paper = db.query(Paper).filter(Paper.id == paper_id).first()
     if not paper:
         raise HTTPException(status_code=404, detail="Paper not found")
-    refs = (
-        db.query(CollectionPaper).filter(CollectionPaper.paper_id == paper_id).count()
-    )
-    if refs > 0:
-        raise HTTPException(
+
+    def _referenced_error() -> HTTPException:
+        # Count computed only for the error message, on the rare path
+        refs = (
+            db.query(CollectionPaper)
+            .filter(CollectionPaper.paper_id == paper_id)
+            .count()
+        )
+        return HTTPException(
             status_code=400, detail=f"Paper is referenced by {refs} collection(s)"
         )
-    db.delete(paper)
-    db.commit()
+
+    # EXISTS guard (cheaper than the old COUNT, and keeps databases created
+    # before the RESTRICT foreign key from cascading memberships away); the
+    # IntegrityError catch makes the check race-free where RESTRICT applies.
+    ref_q = db.query(CollectionPaper).filter(CollectionPaper.paper_id == paper_id)
+    if db.query(ref_q.exists()).scalar():
+        raise _referenced_error()
+    try:
+        db.delete(paper)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise _referenced_error()
 
 
 # --- User Paper Metadata ---
@@ -154,19 +189,18 @@ def update_paper_meta(
     paper = db.query(Paper).filter(Paper.id == paper_id).first()
     if not paper:
         raise HTTPException(status_code=404, detail="Paper not found")
-    meta = (
-        db.query(UserPaperMeta)
-        .filter(
-            UserPaperMeta.user_id == current_user.id,
-            UserPaperMeta.paper_id == paper_id,
+    # Single upsert on (user_id, paper_id) instead of SELECT-then-INSERT/UPDATE,
+    # which also closes the race between concurrent writers.
+    fields = data.model_dump(exclude_unset=True)
+    meta = db.execute(
+        sqlite_insert(UserPaperMeta)
+        .values(user_id=current_user.id, paper_id=paper_id, **fields)
+        .on_conflict_do_update(
+            index_elements=["user_id", "paper_id"],
+            # onupdate hooks don't fire on the conflict branch
+            set_={**fields, "updated_at": datetime.now(timezone.utc)},
         )
-        .first()
-    )
-    if not meta:
-        meta = UserPaperMeta(user_id=current_user.id, paper_id=paper_id)
-        db.add(meta)
-    for field, value in data.model_dump(exclude_unset=True).items():
-        setattr(meta, field, value)
+        .returning(UserPaperMeta)
+    ).scalar_one()
     db.commit()
-    db.refresh(meta)
     return meta
@@ -9,14 +9,22 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import Response
-from pydantic import BaseModel, Field
-from sqlalchemy import or_, select
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from sqlalchemy import func, or_, select
 from sqlalchemy.orm import Session
 
 from auth.deps import get_current_user, get_user_from_api_key
 from database import get_db
 from import_module.bibtex_exporter import export_papers_to_bibtex
-from models import User, Collection, Paper, CollectionPaper, CollectionPermission
+from models import (
+    User,
+    Collection,
+    Paper,
+    CollectionPaper,
+    CollectionPermission,
+    ImportTask,
+)
+from services.collection_cache import invalidate_collection_caches
 from services.permission_service import check_collection_permission
 
 router = APIRouter(prefix="/api/sdk", tags=["sdk"])
@@ -40,6 +48,8 @@ class PaperCreate(BaseModel):
 
 
 class PaperOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     title: str
     authors: list[str]
@@ -58,6 +68,11 @@ class PaperOut(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+    @field_validator("authors", "tags", mode="before")
+    @classmethod
+    def _none_to_empty(cls, value):
+        return value or []
+
 
 class CollectionCreate(BaseModel):
     id: str | None = None
@@ -68,6 +83,8 @@ class CollectionCreate(BaseModel):
 
 
 class CollectionOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     title: str
     description: str | None = None
@@ -78,6 +95,17 @@ class CollectionOut(BaseModel):
     updated_at: datetime
     paper_count: int
 
+    @field_validator("tags", mode="before")
+    @classmethod
+    def _none_to_empty(cls, value):
+        return value or []
+
+
+# List adapters dispatch one validation pass over a whole result set in
+# pydantic-core instead of constructing models field-by-field per row.
+_PAPER_OUT_LIST = TypeAdapter(list[PaperOut])
+_COLLECTION_OUT_LIST = TypeAdapter(list[CollectionOut])
+
 
 class CollectionPaperAdd(BaseModel):
     paper_id: str
@@ -145,46 +173,28 @@ def _accessible_collection_ids_subquery(user_id: str):
 
 
 def _paper_to_out(paper: Paper) -> PaperOut:
-    return PaperOut(
-        id=paper.id,
-        title=paper.title,
-        authors=paper.authors or [],
-        venue=paper.venue,
-        year=paper.year,
-        abstract=paper.abstract,
-        summary=paper.summary,
-        status=paper.status,
-        arxiv_id=paper.arxiv_id,
-        doi=paper.doi,
-        url_arxiv=paper.url_arxiv,
-        url_pdf=paper.url_pdf,
-        url_code=paper.url_code,
-        url_project=paper.url_project,
-        tags=paper.tags or [],
-        created_at=paper.created_at,
-        updated_at=paper.updated_at,
-    )
+    return PaperOut.model_validate(paper)
 
 
-def _collection_to_out(db: Session, collection: Collection) -> CollectionOut:
-    paper_count = (
-        db.query(CollectionPaper)
-        .filter(CollectionPaper.collection_id == collection.id)
-        .count()
-    )
-    return CollectionOut(
-        id=collection.id,
-        title=collection.title,
-        description=collection.description,
-        visibility=collection.visibility,
-        allow_export=collection.allow_export,
-        tags=collection.tags or [],
-        created_at=collection.created_at,
-        updated_at=collection.updated_at,
-        paper_count=paper_count,
+def _paper_counts_subquery(db: Session):
+    """Per-collection paper counts as a subquery, for joining in one statement."""
+    return (
+        db.query(
+            CollectionPaper.collection_id.label("collection_id"),
+            func.count().label("paper_count"),
+        )
+        .group_by(CollectionPaper.collection_id)
+        .subquery()
     )
 
 
+def _collection_to_out(collection: Collection, paper_count: int) -> CollectionOut:
+    # paper_count isn't a mapped column; stash it on the instance so
+    # from_attributes validation picks it up like the rest.
+    collection.paper_count = paper_count
+    return CollectionOut.model_validate(collection)
+
+
 def _require_collection_owner(
     db: Session, collection_id: str, user_id: str
 ) -> Collection:
@@ -278,13 +288,18 @@ def list_collections(
     db: Session = Depends(get_db),
 ) -> list[CollectionOut]:
     """List all collections accessible by the user."""
-    collections = (
-        db.query(Collection)
+    # One grouped outer join instead of a COUNT query per collection
+    counts = _paper_counts_subquery(db)
+    rows = (
+        db.query(Collection, func.coalesce(counts.c.paper_count, 0))
+        .outerjoin(counts, counts.c.collection_id == Collection.id)
         .filter(Collection.id.in_(_accessible_collection_ids_subquery(user.id)))
         .order_by(Collection.created_at.desc())
         .all()
     )
-    return [_collection_to_out(db, collection) for collection in collections]
+    for collection, count in rows:
+        collection.paper_count = count
+    return _COLLECTION_OUT_LIST.validate_python([collection for collection, _ in rows])
 
 
 @router.post("/collections")
@@ -312,9 +327,10 @@ def create_collection(
     )
     db.add(collection)
     db.commit()
+    invalidate_collection_caches()
     db.refresh(collection)
 
-    return _collection_to_out(db, collection)
+    return _collection_to_out(collection, paper_count=0)
 
 
 @router.get("/collections/{collection_id}")
@@ -324,14 +340,21 @@ def get_collection(
     db: Session = Depends(get_db),
 ) -> CollectionOut:
     """Get a collection by ID."""
-    collection = db.query(Collection).filter(Collection.id == collection_id).first()
-    if not collection:
+    counts = _paper_counts_subquery(db)
+    row = (
+        db.query(Collection, func.coalesce(counts.c.paper_count, 0))
+        .outerjoin(counts, counts.c.collection_id == Collection.id)
+        .filter(Collection.id == collection_id)
+        .first()
+    )
+    if not row:
         raise HTTPException(404, "Collection not found")
+    collection, paper_count = row
 
     if not check_collection_permission(db, user.id, collection_id, "view"):
         raise HTTPException(403, "Access denied")
 
-    return _collection_to_out(db, collection)
+    return _collection_to_out(collection, paper_count)
 
 
 @router.get("/collections/{collection_id}/permissions")
@@ -383,6 +406,7 @@ def add_collection_permission(
     )
     db.add(permission)
     db.commit()
+    invalidate_collection_caches()
     db.refresh(permission)
 
     return _permission_to_out(db, permission)
@@ -403,6 +427,7 @@ def remove_collection_permission(
         CollectionPermission.user_id == target_user_id,
     ).delete(synchronize_session=False)
     db.commit()
+    invalidate_collection_caches()
     return {"ok": True}
 
 
@@ -476,8 +501,14 @@ def delete_collection(
     if collection.created_by != user.id:
         raise HTTPException(403, "Only the owner can delete this collection")
 
+    # Detach import tasks explicitly; databases created before the SET NULL
+    # foreign key would otherwise block the delete.
+    db.query(ImportTask).filter(ImportTask.collection_id == collection_id).update(
+        {"collection_id": None}, synchronize_session=False
+    )
     db.delete(collection)
     db.commit()
+    invalidate_collection_caches()
     return {"ok": True}
 
 
@@ -525,6 +556,7 @@ def add_paper_to_collection(
     db.add(collection_paper)
 
     db.commit()
+    invalidate_collection_caches()
     db.refresh(paper)
 
     return _paper_to_out(paper)
@@ -544,18 +576,14 @@ def list_papers_in_collection(
     if not check_collection_permission(db, user.id, collection_id, "view"):
         raise HTTPException(403, "Access denied")
 
-    collection_papers = (
-        db.query(CollectionPaper)
+    # Single join instead of fetching membership rows and re-querying by id
+    papers = (
+        db.query(Paper)
+        .join(CollectionPaper, CollectionPaper.paper_id == Paper.id)
         .filter(CollectionPaper.collection_id == collection_id)
         .all()
     )
-    paper_ids = [collection_paper.paper_id for collection_paper in collection_papers]
-
-    if not paper_ids:
-        return []
-
-    papers = db.query(Paper).filter(Paper.id.in_(paper_ids)).all()
-    return [_paper_to_out(paper) for paper in papers]
+    return _PAPER_OUT_LIST.validate_python(papers)
 
 
 @router.get("/papers/search")
@@ -583,7 +611,7 @@ def search_papers(
         query = query.filter(Paper.status == status_filter)
 
     papers = query.order_by(Paper.created_at.desc()).limit(limit).all()
-    return [_paper_to_out(paper) for paper in papers]
+    return _PAPER_OUT_LIST.validate_python(papers)
 
 
 @router.get("/papers/{paper_id}")
@@ -593,17 +621,30 @@ def get_paper(
     db: Session = Depends(get_db),
 ) -> PaperOut:
     """Get a paper by ID."""
-    paper = db.query(Paper).filter(Paper.id == paper_id).first()
-    if not paper:
+    # Paper, "is it in any collection", and "is one of them viewable" in a
+    # single statement, instead of fetching every membership row and running
+    # a permission check per collection.
+    referenced = (
+        select(CollectionPaper.id)
+        .where(CollectionPaper.paper_id == paper_id)
+        .exists()
+    )
+    viewable = (
+        select(CollectionPaper.id)
+        .where(
+            CollectionPaper.paper_id == paper_id,
+            CollectionPaper.collection_id.in_(
+                _accessible_collection_ids_subquery(user.id)
+            ),
+        )
+        .exists()
+    )
+    row = db.query(Paper, referenced, viewable).filter(Paper.id == paper_id).first()
+    if not row:
         raise HTTPException(404, "Paper not found")
+    paper, has_refs, can_view = row
 
-    collection_refs = (
-        db.query(CollectionPaper).filter(CollectionPaper.paper_id == paper_id).all()
-    )
-    if collection_refs and not any(
-        check_collection_permission(db, user.id, collection_ref.collection_id, "view")
-        for collection_ref in collection_refs
-    ):
+    if has_refs and not can_view:
         raise HTTPException(403, "Access denied")
 
     return _paper_to_out(paper)
@@ -637,4 +678,5 @@ def remove_paper_from_collection(
 
     db.delete(collection_paper)
     db.commit()
+    invalidate_collection_caches()
     return {"ok": True}
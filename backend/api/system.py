@@ -1,9 +1,15 @@
 from pathlib import Path
 import secrets
+import time
 from urllib.parse import urlencode
 
 import httpx
 import yaml
+
+try:  # libyaml-backed loader/dumper when available (5-20x faster)
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import RedirectResponse
 from pydantic import BaseModel
@@ -15,6 +21,7 @@ from auth.deps import get_admin_user
 from config import config
 from database import get_db
 from models import User
+from services.collection_cache import TTLStore
 
 router = APIRouter(prefix="/api/system", tags=["system"])
 
@@ -42,9 +49,37 @@ class BrandingUpdate(BaseModel):
     branding: str
 
 
+# The frontend polls /status on every page load, but after setup the answer
+# never changes: cache the has_users probe as a one-way latch (True can't flip
+# back), with a short TTL while the system is still uninitialized.
+_HAS_USERS_TTL = 5.0
+_has_users_cache: tuple[float, bool] | None = None
+
+
+def _any_users(db: Session) -> bool:
+    # EXISTS short-circuits on the first row instead of counting them all
+    return db.query(db.query(User).exists()).scalar()
+
+
+def _system_has_users(db: Session) -> bool:
+    global _has_users_cache
+    if _has_users_cache is not None:
+        deadline, has_users = _has_users_cache
+        if has_users or time.monotonic() < deadline:
+            return has_users
+    has_users = _any_users(db)
+    _has_users_cache = (time.monotonic() + _HAS_USERS_TTL, has_users)
+    return has_users
+
+
+def _mark_initialized():
+    global _has_users_cache
+    _has_users_cache = (0.0, True)
+
+
 @router.get("/status", response_model=SystemStatusResponse)
 def system_status(db: Session = Depends(get_db)):
-    has_users = db.query(User).count() > 0
+    has_users = _system_has_users(db)
     return SystemStatusResponse(
         initialized=has_users,
         auth_type=config.auth.type,
@@ -55,7 +90,7 @@ def system_status(db: Session = Depends(get_db)):
 
 @router.post("/setup", response_model=SetupResponse)
 def setup_admin(body: SetupRequest, db: Session = Depends(get_db)):
-    if db.query(User).count() > 0:
+    if _any_users(db):
         raise HTTPException(status_code=409, detail="System already initialized")
 
     if not body.username or not body.username.strip():
@@ -76,6 +111,8 @@ def setup_admin(body: SetupRequest, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(user)
 
+    _mark_initialized()
+
     # Persist admin_username to config.yaml
     _update_config_admin_username(user.username)
 
@@ -92,7 +129,13 @@ def _update_config_admin_username(username: str):
         return
 
     with open(config_path) as f:
-        data = yaml.safe_load(f) or {}
+        data = yaml.load(f, Loader=SafeLoader) or {}
+
+    # Skip the rewrite when the file already says exactly this
+    has_stale_users = "auth" in data and "users" in (data["auth"].get("simple") or {})
+    if data.get("admin_username") == username and not has_stale_users:
+        config.admin_username = username
+        return
 
     data["admin_username"] = username
 
@@ -101,7 +144,9 @@ def _update_config_admin_username(username: str):
         data["auth"]["simple"].pop("users", None)
 
     with open(config_path, "w") as f:
-        yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+        yaml.dump(
+            data, f, Dumper=SafeDumper, default_flow_style=False, allow_unicode=True
+        )
 
     # Update the in-memory config
     config.admin_username = username
@@ -109,13 +154,19 @@ def _update_config_admin_username(username: str):
 
 # ── OAuth setup flow ──
 
-_setup_oauth_states: dict[str, bool] = {}
+# Shared client for the one-time setup exchange; async so the provider
+# round-trip doesn't block a worker. Closed in app shutdown.
+_oauth_http = httpx.AsyncClient(timeout=10.0)
+
+# Setup OAuth states expire and the store is capped, so abandoned setup
+# handshakes can't grow memory without bound (same store as api/auth.py).
+_setup_oauth_states = TTLStore(ttl=600, max_entries=1000)
 
 
 @router.get("/setup/oauth/start")
 def setup_oauth_start(db: Session = Depends(get_db)):
     """Start OAuth setup flow. Only available when no users exist."""
-    if db.query(User).count() > 0:
+    if _any_users(db):
         raise HTTPException(409, "System already initialized")
 
     oauth = config.auth.oauth
@@ -123,7 +174,7 @@ def setup_oauth_start(db: Session = Depends(get_db)):
         raise HTTPException(400, "OAuth is not configured")
 
     state = secrets.token_urlsafe(32)
-    _setup_oauth_states[state] = True
+    _setup_oauth_states.put(state)
 
     params = {
         "client_id": oauth.client_id,
@@ -137,19 +188,18 @@ def setup_oauth_start(db: Session = Depends(get_db)):
 
 
 @router.get("/setup/oauth/callback")
-def setup_oauth_callback(code: str, state: str, db: Session = Depends(get_db)):
+async def setup_oauth_callback(code: str, state: str, db: Session = Depends(get_db)):
     """OAuth callback for setup. Creates the first admin user from OAuth identity."""
-    if db.query(User).count() > 0:
+    if _any_users(db):
         raise HTTPException(409, "System already initialized")
 
-    if state not in _setup_oauth_states:
+    if not _setup_oauth_states.consume(state):
         raise HTTPException(400, "Invalid OAuth state")
-    _setup_oauth_states.pop(state, None)
 
     oauth = config.auth.oauth
 
     # Exchange code for access token
-    resp = httpx.post(
+    resp = await _oauth_http.post(
         oauth.token_endpoint,
         data={
             "grant_type": "authorization_code",
@@ -166,7 +216,7 @@ def setup_oauth_callback(code: str, state: str, db: Session = Depends(get_db)):
         raise HTTPException(400, "Failed to obtain access token from OAuth provider")
 
     # Get user info
-    resp = httpx.get(
+    resp = await _oauth_http.get(
         oauth.userinfo_endpoint,
         headers={
             "Authorization": f"Bearer {access_token}",
@@ -201,6 +251,7 @@ def setup_oauth_callback(code: str, state: str, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(user)
 
+    _mark_initialized()
     _update_config_admin_username(user.username)
 
     jwt_token = create_access_token({"sub": user.id, "username": user.username})
@@ -227,12 +278,18 @@ def _update_config_branding(branding: str):
     data: dict = {}
     if config_path.exists():
         with open(config_path) as f:
-            data = yaml.safe_load(f) or {}
+            data = yaml.load(f, Loader=SafeLoader) or {}
+
+    if data.get("branding") == branding:
+        config.branding = branding
+        return
 
     data["branding"] = branding
 
     with open(config_path, "w") as f:
-        yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+        yaml.dump(
+            data, f, Dumper=SafeDumper, default_flow_style=False, allow_unicode=True
+        )
 
     # Update the in-memory config
     config.branding = branding
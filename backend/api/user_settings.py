@@ -1,5 +1,8 @@
+from datetime import datetime, timezone
+
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from auth.deps import get_current_user
@@ -73,18 +76,16 @@ def update_setting(
     if body.key not in ALLOWED_KEYS:
         raise HTTPException(400, f"Unknown setting key: {body.key}")
 
-    row = (
-        db.query(UserSetting)
-        .filter(UserSetting.user_id == user.id, UserSetting.key == body.key)
-        .first()
+    # Single upsert on (user_id, key) instead of SELECT-then-INSERT/UPDATE
+    db.execute(
+        sqlite_insert(UserSetting)
+        .values(user_id=user.id, key=body.key, value=body.value)
+        .on_conflict_do_update(
+            index_elements=["user_id", "key"],
+            # onupdate hooks don't fire on the conflict branch
+            set_={"value": body.value, "updated_at": datetime.now(timezone.utc)},
+        )
     )
-
-    if row:
-        row.value = body.value
-    else:
-        row = UserSetting(user_id=user.id, key=body.key, value=body.value)
-        db.add(row)
-
     db.commit()
     return {"ok": True}
 
@@ -29,7 +29,7 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if user is None or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -64,7 +64,7 @@ async def get_current_user_optional(
     if user_id is None:
         return None
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if user is None or not user.is_active:
         return None
 
@@ -102,7 +102,7 @@ async def get_user_from_api_key(
     for api_key in api_keys:
         if api_key.is_active and ApiKey.verify_key(x_api_key, api_key.key_hash):
             matched_key = api_key
-            user = db.query(User).filter(User.id == api_key.user_id).first()
+            user = db.get(User, api_key.user_id)
             break
 
     if user is None or not user.is_active:
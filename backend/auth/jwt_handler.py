@@ -1,6 +1,7 @@
-from datetime import datetime, timedelta, timezone
+import time
+from datetime import timedelta
 
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 
 from config import config
 
@@ -8,17 +9,23 @@ SECRET_KEY = config.auth.jwt.secret_key
 ALGORITHM = config.auth.jwt.algorithm
 EXPIRE_DAYS = config.auth.jwt.expire_days
 
+# Construct the signing key object once; jose otherwise re-derives it on
+# every encode/decode. Integer expiry skips the datetime conversion path.
+_SIGNING_KEY = jwk.construct(SECRET_KEY, ALGORITHM)
+_EXPIRE_SECONDS = EXPIRE_DAYS * 86400
+
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(days=EXPIRE_DAYS))
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    to_encode["exp"] = int(time.time()) + (
+        int(expires_delta.total_seconds()) if expires_delta else _EXPIRE_SECONDS
+    )
+    return jwt.encode(to_encode, _SIGNING_KEY, algorithm=ALGORITHM)
 
 
 def decode_access_token(token: str) -> dict | None:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, _SIGNING_KEY, algorithms=[ALGORITHM])
         return payload
     except JWTError:
         return None
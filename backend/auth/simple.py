@@ -1,11 +1,26 @@
-from passlib.context import CryptContext
+import bcrypt
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Direct bcrypt binding; skips passlib's per-call handler introspection while
+# staying compatible with existing $2b$ hashes.
+_BCRYPT_ROUNDS = 12
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(
+            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+        )
+    except ValueError:
+        # Malformed/legacy hash; treat as non-matching rather than a 500.
+        return False
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(
+        password.encode("utf-8"), bcrypt.gensalt(rounds=_BCRYPT_ROUNDS)
+    ).decode("utf-8")
+
+
+# Verified in place of a real hash when the user does not exist, so login
+# timing cannot reveal whether a username is registered.
+DUMMY_PASSWORD_HASH = get_password_hash("not-a-real-password")
@@ -42,6 +42,8 @@ class AppConfig(BaseModel):
     admin_username: str = ""
     data_dir: str = "../data"
     branding: str = "ShareBib"
+    # Dev/test only: make accidental lazy loads raise instead of querying
+    debug_raiseload: bool = False
 
 
 def _get_config_path() -> Path:
@@ -104,6 +106,12 @@ def load_config() -> AppConfig:
         cfg.admin_username = os.environ["ADMIN_USERNAME"]
     if os.environ.get("DATA_DIR"):
         cfg.data_dir = os.environ["DATA_DIR"]
+    if os.environ.get("DEBUG_RAISELOAD"):
+        cfg.debug_raiseload = os.environ["DEBUG_RAISELOAD"].lower() in (
+            "1",
+            "true",
+            "yes",
+        )
 
     # OAuth env vars override config.yaml
     if os.environ.get("OAUTH_CLIENT_ID"):
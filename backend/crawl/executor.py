@@ -9,6 +9,7 @@ from models import Paper, Collection, CollectionPaper
 from models.crawl_task import CrawlTask
 from models.user_setting import UserSetting
 from crawl.sources import get_source
+from services.collection_cache import invalidate_collection_caches
 from services.deduplication import find_duplicate_paper
 
 logger = logging.getLogger(__name__)
@@ -107,6 +108,8 @@ class CrawlExecutor:
                     result["errors"].append({"title": fetched.title, "reason": str(e)})
 
             db.commit()
+            # A run may have created a collection or changed paper counts
+            invalidate_collection_caches()
 
         except Exception as e:
             logger.error(f"Crawl execution failed for task {task.id}: {e}")
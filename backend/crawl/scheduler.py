@@ -33,6 +33,8 @@ class CrawlScheduler:
         self._running_tasks: set[str] = (
             set()
         )  # Reentrancy guard: currently executing task IDs
+        # Strong refs to fire-and-forget runs; asyncio only keeps weak ones
+        self._background_runs: set[asyncio.Task] = set()
 
     async def start(self):
         """Called on FastAPI startup"""
@@ -45,8 +47,27 @@ class CrawlScheduler:
         self._stop_event.set()
         if self._task:
             await self._task
+        if self._background_runs:
+            # Let manually triggered runs finish instead of dying mid-crawl
+            await asyncio.gather(*self._background_runs, return_exceptions=True)
         logger.info("CrawlScheduler stopped")
 
+    def submit_task_now(self, task_id: str) -> None:
+        """Schedule run_task_now in the background, tracked until completion.
+
+        A bare asyncio.create_task would be garbage-collectable and would
+        swallow exceptions; runs submitted here are referenced until done and
+        failures are logged.
+        """
+        run = asyncio.create_task(self.run_task_now(task_id))
+        self._background_runs.add(run)
+        run.add_done_callback(self._on_background_run_done)
+
+    def _on_background_run_done(self, run: asyncio.Task) -> None:
+        self._background_runs.discard(run)
+        if not run.cancelled() and run.exception():
+            logger.error(f"Manually triggered crawl task failed: {run.exception()}")
+
     async def run_task_now(self, task_id: str) -> bool:
         """Run a task immediately. Returns False if the task is already running."""
         if task_id in self._running_tasks:
@@ -3,7 +3,7 @@ import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from database import init_db
+from database import init_db, warm_pool
 from api.auth import router as auth_router
 from api.collections import router as collections_router
 from api.papers import router as papers_router
@@ -47,12 +47,20 @@ app.include_router(sdk_router)
 @app.on_event("startup")
 async def on_startup():
     init_db()
+    warm_pool()
     await scheduler.start()
 
 
 @app.on_event("shutdown")
 async def on_shutdown():
     await scheduler.stop()
+    from api.auth import _http as _auth_http
+    from api.import_tasks import _arxiv_http
+    from api.system import _oauth_http
+
+    await _arxiv_http.aclose()
+    await _auth_http.aclose()
+    await _oauth_http.aclose()
 
 
 @app.get("/api/stats")
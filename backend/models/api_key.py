@@ -1,8 +1,10 @@
+import hashlib
+import hmac
 import secrets
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import String, DateTime, Boolean
+from sqlalchemy import String, DateTime, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from database import Base
@@ -35,6 +37,13 @@ class ApiKey(Base):
         onupdate=lambda: datetime.now(timezone.utc),
     )
 
+    __table_args__ = (
+        # Composite index backing the per-user key lookups in delete/toggle
+        Index("ix_api_keys_user_id_id", "user_id", "id"),
+        # Covers the prefix probe in API-key authentication
+        Index("ix_api_keys_prefix_active", "key_prefix", "is_active"),
+    )
+
     @staticmethod
     def generate_key() -> str:
         """Generate a new API key with format: pc_<32 random chars>"""
@@ -42,16 +51,27 @@ class ApiKey(Base):
 
     @staticmethod
     def hash_key(key: str) -> str:
-        """Hash an API key for storage"""
-        from passlib.context import CryptContext
+        """Hash an API key for storage.
+
+        Keys are high-entropy random strings, so a keyed HMAC-SHA256 is
+        sufficient and orders of magnitude cheaper than a password KDF.
+        """
+        from config import config
 
-        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        return pwd_context.hash(key)
+        secret = config.auth.jwt.secret_key.encode("utf-8")
+        return hmac.new(secret, key.encode("utf-8"), hashlib.sha256).hexdigest()
 
     @staticmethod
     def verify_key(plain_key: str, hashed_key: str) -> bool:
         """Verify an API key against its hash"""
-        from passlib.context import CryptContext
+        if hashed_key.startswith("$2"):
+            # Legacy bcrypt hash from before the HMAC switch
+            import bcrypt
 
-        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        return pwd_context.verify(plain_key, hashed_key)
+            try:
+                return bcrypt.checkpw(
+                    plain_key.encode("utf-8"), hashed_key.encode("utf-8")
+                )
+            except ValueError:
+                return False
+        return hmac.compare_digest(ApiKey.hash_key(plain_key), hashed_key)
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import String, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database import Base
@@ -16,8 +16,10 @@ class CollectionPaper(Base):
         nullable=False,
         index=True,
     )
+    # RESTRICT: deleting a referenced paper must fail at the DB level, so the
+    # API's "paper is referenced" 400 is race-free instead of check-then-delete.
     paper_id: Mapped[str] = mapped_column(
-        String, ForeignKey("papers.id", ondelete="CASCADE"), nullable=False, index=True
+        String, ForeignKey("papers.id", ondelete="RESTRICT"), nullable=False, index=True
     )
     group_name: Mapped[str | None] = mapped_column(String)
     group_tag: Mapped[str | None] = mapped_column(String)
@@ -27,7 +29,11 @@ class CollectionPaper(Base):
         DateTime, default=lambda: datetime.now(timezone.utc)
     )
 
-    __table_args__ = (UniqueConstraint("collection_id", "paper_id"),)
+    __table_args__ = (
+        UniqueConstraint("collection_id", "paper_id"),
+        # Serves the ordered listing in get_collection without a sort step
+        Index("ix_collection_papers_collection_order", "collection_id", "display_order"),
+    )
 
     collection: Mapped["Collection"] = relationship(back_populates="papers")  # noqa: F821
     paper: Mapped["Paper"] = relationship(back_populates="collections")  # noqa: F821
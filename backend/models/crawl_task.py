@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import String, Boolean, DateTime, ForeignKey, JSON
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Boolean, DateTime, ForeignKey, Index, JSON
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database import Base
 
@@ -14,7 +14,7 @@ class CrawlTask(Base):
         String, primary_key=True, default=lambda: str(uuid.uuid4())
     )
     user_id: Mapped[str] = mapped_column(
-        String, ForeignKey("users.id"), nullable=False, index=True
+        String, ForeignKey("users.id"), nullable=False
     )
     name: Mapped[str] = mapped_column(String, nullable=False)
 
@@ -55,3 +55,14 @@ class CrawlTask(Base):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
+
+    __table_args__ = (
+        # Backs list_crawl_tasks: WHERE user_id=? ORDER BY created_at DESC
+        Index("ix_crawl_tasks_user_created", "user_id", "created_at"),
+    )
+
+    target_collection: Mapped["Collection | None"] = relationship("Collection")  # noqa: F821
+
+    @property
+    def target_collection_name(self) -> str | None:
+        return self.target_collection.title if self.target_collection else None
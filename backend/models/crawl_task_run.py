@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import String, DateTime, ForeignKey, JSON
+from sqlalchemy import String, DateTime, ForeignKey, Index, JSON
 from sqlalchemy.orm import Mapped, mapped_column
 
 from database import Base
@@ -17,7 +17,6 @@ class CrawlTaskRun(Base):
         String,
         ForeignKey("crawl_tasks.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     status: Mapped[str] = mapped_column(
         String, nullable=False
@@ -28,3 +27,8 @@ class CrawlTaskRun(Base):
         DateTime, default=lambda: datetime.now(timezone.utc)
     )
     finished_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    __table_args__ = (
+        # Backs list_task_runs: WHERE task_id=? ORDER BY started_at DESC
+        Index("ix_crawl_task_runs_task_started", "task_id", "started_at"),
+    )
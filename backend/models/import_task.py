@@ -20,8 +20,10 @@ class ImportTask(Base):
     status: Mapped[str] = mapped_column(String, default="processing", index=True)
     config: Mapped[dict | None] = mapped_column(JSON)
     result: Mapped[dict | None] = mapped_column(JSON)
+    # SET NULL: deleting a collection must not be blocked by the import task
+    # that created it; the task record stays useful without the link.
     collection_id: Mapped[str | None] = mapped_column(
-        String, ForeignKey("collections.id")
+        String, ForeignKey("collections.id", ondelete="SET NULL")
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=lambda: datetime.now(timezone.utc)
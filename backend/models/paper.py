@@ -1,12 +1,21 @@
+import re
 import uuid
 from datetime import datetime, timezone
 
 from sqlalchemy import String, Integer, Text, DateTime, JSON
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from database import Base
 
 
+def normalize_title(title: str) -> str:
+    """Normalize title for fuzzy matching."""
+    title = title.lower()
+    title = re.sub(r"[^\w\s]", "", title)  # Remove punctuation
+    title = re.sub(r"\s+", " ", title).strip()  # Collapse whitespace
+    return title
+
+
 class Paper(Base):
     __tablename__ = "papers"
 
@@ -14,12 +23,15 @@ class Paper(Base):
         String, primary_key=True, default=lambda: str(uuid.uuid4())
     )
     title: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    # Denormalized copy of title as produced by normalize_title, kept in sync
+    # by _sync_normalized_title so dedup can match on an indexed column.
+    normalized_title: Mapped[str | None] = mapped_column(String, index=True)
     authors: Mapped[list | None] = mapped_column(JSON)
     venue: Mapped[str | None] = mapped_column(String)
     year: Mapped[int | None] = mapped_column(Integer, index=True)
     abstract: Mapped[str | None] = mapped_column(Text)
     summary: Mapped[str | None] = mapped_column(Text)
-    status: Mapped[str] = mapped_column(String, default="no_access")
+    status: Mapped[str] = mapped_column(String, default="no_access", index=True)
     bibtex_key: Mapped[str | None] = mapped_column(String, index=True)
     arxiv_id: Mapped[str | None] = mapped_column(String, index=True)
     doi: Mapped[str | None] = mapped_column(String, index=True)
@@ -28,8 +40,10 @@ class Paper(Base):
     url_code: Mapped[str | None] = mapped_column(String)
     url_project: Mapped[str | None] = mapped_column(String)
     tags: Mapped[list | None] = mapped_column(JSON)
+    # Indexed: list_papers pages by created_at DESC with offset/limit, and
+    # SQLite walks a plain index backwards for that.
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=lambda: datetime.now(timezone.utc)
+        DateTime, default=lambda: datetime.now(timezone.utc), index=True
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
@@ -38,3 +52,14 @@ class Paper(Base):
     )
 
     collections: Mapped[list["CollectionPaper"]] = relationship(back_populates="paper")  # noqa: F821
+
+    @validates("title")
+    def _sync_normalized_title(self, key, value):
+        self.normalized_title = normalize_title(value) if value else None
+        return value
+
+    @validates("doi")
+    def _normalize_doi(self, key, value):
+        # DOIs are case-insensitive per spec; store them lowercased so the
+        # indexed equality probes in deduplication behave that way too.
+        return value.lower() if value else value
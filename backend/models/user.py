@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import String, Boolean, DateTime
+from sqlalchemy import String, Boolean, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database import Base
@@ -32,6 +32,9 @@ class User(Base):
         onupdate=lambda: datetime.now(timezone.utc),
     )
 
+    # Composite index backing the OAuth callback lookup
+    __table_args__ = (Index("ix_users_oauth_provider_sub", "oauth_provider", "oauth_sub"),)
+
     collections: Mapped[list["Collection"]] = relationship(back_populates="creator")  # noqa: F821
     permissions: Mapped[list["CollectionPermission"]] = relationship(  # noqa: F821
         back_populates="user"
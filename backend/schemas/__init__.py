@@ -8,6 +8,7 @@ from .collection import (
     PermissionCreate,
     PermissionOut,
     CollectionPaperAdd,
+    CollectionPaperBulkAdd,
     CollectionPaperUpdate,
     PaperReorder,
 )
@@ -30,6 +31,7 @@ __all__ = [
     "PermissionCreate",
     "PermissionOut",
     "CollectionPaperAdd",
+    "CollectionPaperBulkAdd",
     "CollectionPaperUpdate",
     "PaperReorder",
     "PaperCreate",
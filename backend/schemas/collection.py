@@ -116,6 +116,13 @@ class CollectionPaperAdd(BaseModel):
     display_order: int = 0
 
 
+class CollectionPaperBulkAdd(BaseModel):
+    paper_ids: list[str]
+    group_name: str | None = None
+    group_tag: str | None = None
+    section_name: str | None = None
+
+
 class PaperCreateInline(BaseModel):
     title: str
     authors: list[str] | None = None
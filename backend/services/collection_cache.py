@@ -0,0 +1,92 @@
+"""
+Shared in-process caches.
+
+Holds the collection list cache — in services so every writer (the
+collections router, the SDK router, the import workers, and the crawl
+executor) can invalidate it without importing an api module — and the
+bounded TTL store used for short-lived per-key state (OAuth handshakes,
+scan results).
+"""
+
+import threading
+import time
+
+
+class TTLStore:
+    """Bounded in-process store with per-entry time-to-live.
+
+    Expired entries are purged on each write, and the store is capped by
+    evicting oldest entries first, so abandoned keys cannot grow memory
+    without bound. Single-process deployment only; a shared store would be
+    needed with multiple workers.
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self._ttl = ttl
+        self._max = max_entries
+        self._entries: dict[str, tuple[float, object]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, key: str, value: object = None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                k for k, (deadline, _) in self._entries.items() if deadline <= now
+            ]
+            for k in expired:
+                del self._entries[k]
+            while len(self._entries) >= self._max:
+                # Dicts preserve insertion order, so the first key is the oldest.
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (now + self._ttl, value)
+
+    def get(self, key: str):
+        """Return the stored value, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            deadline, value = entry
+            if deadline <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def consume(self, key: str) -> bool:
+        """Remove the key; True if it existed and had not expired."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return entry is not None and entry[0] > time.monotonic()
+
+# Short-lived per-user cache for the read-heavy list endpoint. Any collection
+# mutation clears the whole cache, since public/shared collections show up in
+# other users' lists too. (This process is the only writer, so in-process
+# caching is safe; a shared store would be needed with multiple workers.)
+_LIST_CACHE_TTL = 30.0
+_list_cache: dict[str, tuple[float, list]] = {}
+_list_cache_lock = threading.Lock()
+
+
+def list_cache_get(user_id: str):
+    with _list_cache_lock:
+        entry = _list_cache.get(user_id)
+        if entry is None:
+            return None
+        deadline, value = entry
+        if deadline <= time.monotonic():
+            del _list_cache[user_id]
+            return None
+        return value
+
+
+def list_cache_put(user_id: str, value: list) -> None:
+    with _list_cache_lock:
+        _list_cache[user_id] = (time.monotonic() + _LIST_CACHE_TTL, value)
+
+
+def invalidate_collection_caches() -> None:
+    """Clear the cached lists. Call after any write that changes what some
+    user's collection list shows: collections themselves, their memberships
+    (paper counts), or permission grants."""
+    with _list_cache_lock:
+        _list_cache.clear()
@@ -4,12 +4,15 @@ Deduplication service for paper imports.
 Provides duplicate detection and information tracking for BibTeX imports.
 """
 
-import re
+import uuid
 from enum import Enum
+
 from pydantic import BaseModel
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from models import Paper
+from models.paper import normalize_title  # noqa: F401 (re-exported for callers)
 
 
 class DuplicateMatchType(str, Enum):
@@ -39,14 +42,6 @@ class DuplicateInfo(BaseModel):
     existing_venue: str | None = None
 
 
-def normalize_title(title: str) -> str:
-    """Normalize title for fuzzy matching."""
-    title = title.lower()
-    title = re.sub(r"[^\w\s]", "", title)  # Remove punctuation
-    title = re.sub(r"\s+", " ", title).strip()  # Collapse whitespace
-    return title
-
-
 def find_duplicate_paper(
     db: Session, paper_data: dict, owner_user_id: str | None = None
 ) -> tuple[Paper | None, DuplicateInfo | None]:
@@ -124,9 +119,11 @@ def find_duplicate_paper(
             )
             return existing, info
 
-    # 3. Try DOI
+    # 3. Try DOI. Case-insensitive: new rows store lowercase, but probe with
+    # both forms so rows written before normalization still match.
     if paper_data.get("doi"):
-        existing = get_paper_query().filter(Paper.doi == paper_data["doi"]).first()
+        doi = paper_data["doi"]
+        existing = get_paper_query().filter(Paper.doi.in_({doi, doi.lower()})).first()
         if existing:
             info = DuplicateInfo(
                 entry_id=entry_id,
@@ -144,17 +141,13 @@ def find_duplicate_paper(
             )
             return existing, info
 
-    # 4. Try normalized title
+    # 4. Try normalized title (stored on the row, so this is an indexed lookup)
     normalized_title = normalize_title(paper_data["title"])
-    # Query papers with owner filtering and check normalized titles in Python
-    # (SQLite doesn't have good regex support for complex normalization)
-    all_papers = get_paper_query().all()
-    for paper in all_papers:
-        if normalize_title(paper.title) == normalized_title:
-            existing = paper
-            break
-    else:
-        existing = None
+    existing = (
+        get_paper_query()
+        .filter(Paper.normalized_title == normalized_title)
+        .first()
+    )
     if existing:
         info = DuplicateInfo(
             entry_id=entry_id,
@@ -173,3 +166,139 @@ def find_duplicate_paper(
         return existing, info
 
     return None, None
+
+
+def find_duplicates_bulk(
+    db: Session, papers_data: list[dict], owner_user_id: str | None = None
+) -> list[tuple[Paper | None, DuplicateInfo | None]]:
+    """
+    Resolve duplicates for many parsed entries with a single candidate query.
+
+    Returns a list parallel to papers_data: (existing_paper, duplicate_info)
+    per entry, or (None, None) when no duplicate was found. Matching follows
+    the same priority as find_duplicate_paper (bibtex_key > arxiv_id > doi >
+    normalized title), but the N per-entry SELECTs collapse into one.
+
+    Entries classified as new are registered into the in-memory match maps so
+    later entries in the same batch still hit them (within-file repeats never
+    reach the database before this runs). Each new entry gets an "id" assigned
+    into its dict; callers must reuse it for the eventual INSERT so that
+    duplicate matches against a pending row reference the row actually written.
+    A match against a pending row returns a transient Paper carrying the source
+    dict as `_pending_row`, which callers can mutate for use_new decisions.
+    """
+    from models import Collection, CollectionPaper
+
+    wanted_keys = {
+        field: {pd[field] for pd in papers_data if pd.get(field)}
+        for field in ("bibtex_key", "arxiv_id", "doi")
+    }
+    # DOI matching is case-insensitive; widen the probe set so rows written
+    # before lowercase normalization still match.
+    wanted_keys["doi"] |= {v.lower() for v in wanted_keys["doi"]}
+    wanted_titles = {
+        normalize_title(pd["title"]) for pd in papers_data if pd.get("title")
+    }
+
+    conditions = []
+    if wanted_keys["bibtex_key"]:
+        conditions.append(Paper.bibtex_key.in_(wanted_keys["bibtex_key"]))
+    if wanted_keys["arxiv_id"]:
+        conditions.append(Paper.arxiv_id.in_(wanted_keys["arxiv_id"]))
+    if wanted_keys["doi"]:
+        conditions.append(Paper.doi.in_(wanted_keys["doi"]))
+    if wanted_titles:
+        conditions.append(Paper.normalized_title.in_(wanted_titles))
+    if not conditions:
+        return [(None, None)] * len(papers_data)
+
+    query = db.query(Paper)
+    if owner_user_id:
+        query = (
+            query.join(CollectionPaper, CollectionPaper.paper_id == Paper.id)
+            .join(Collection, Collection.id == CollectionPaper.collection_id)
+            .filter(Collection.created_by == owner_user_id)
+            .distinct()
+        )
+    candidates = query.filter(or_(*conditions)).all()
+
+    by_key: dict[str, dict[str, Paper]] = {
+        "bibtex_key": {},
+        "arxiv_id": {},
+        "doi": {},
+        "title": {},
+    }
+    for paper in candidates:
+        for field in ("bibtex_key", "arxiv_id", "doi"):
+            value = getattr(paper, field)
+            if value:
+                by_key[field].setdefault(
+                    value.lower() if field == "doi" else value, paper
+                )
+        nt = paper.normalized_title or normalize_title(paper.title)
+        by_key["title"].setdefault(nt, paper)
+
+    match_order = (
+        ("bibtex_key", DuplicateMatchType.BIBTEX_KEY),
+        ("arxiv_id", DuplicateMatchType.ARXIV_ID),
+        ("doi", DuplicateMatchType.DOI),
+    )
+    results: list[tuple[Paper | None, DuplicateInfo | None]] = []
+    for pd in papers_data:
+        existing = None
+        match_type = None
+        match_value = None
+        for field, mtype in match_order:
+            value = pd.get(field)
+            if field == "doi" and value:
+                value = value.lower()
+            if value and value in by_key[field]:
+                existing = by_key[field][value]
+                match_type, match_value = mtype, value
+                break
+        if existing is None and pd.get("title"):
+            nt = normalize_title(pd["title"])
+            if nt in by_key["title"]:
+                existing = by_key["title"][nt]
+                match_type, match_value = DuplicateMatchType.TITLE, nt
+        if existing is None:
+            # New entry: register it so later entries in this batch match it.
+            # The transient Paper is never added to the session; its id is
+            # pushed into pd so the caller inserts the row under the same id.
+            pending = Paper(
+                id=pd.setdefault("id", str(uuid.uuid4())),
+                title=pd.get("title") or "",
+                authors=pd.get("authors"),
+                venue=pd.get("venue"),
+                year=pd.get("year"),
+                bibtex_key=pd.get("bibtex_key"),
+                arxiv_id=pd.get("arxiv_id"),
+                doi=pd.get("doi"),
+            )
+            pending._pending_row = pd
+            for field in ("bibtex_key", "arxiv_id", "doi"):
+                value = pd.get(field)
+                if value:
+                    by_key[field].setdefault(
+                        value.lower() if field == "doi" else value, pending
+                    )
+            if pd.get("title"):
+                by_key["title"].setdefault(normalize_title(pd["title"]), pending)
+            results.append((None, None))
+            continue
+        info = DuplicateInfo(
+            entry_id=pd.get("_entry_id", "unknown"),
+            new_title=pd["title"],
+            existing_paper_id=existing.id,
+            existing_title=existing.title,
+            match_type=match_type,
+            match_value=match_value,
+            new_authors=pd.get("authors"),
+            existing_authors=existing.authors,
+            new_year=pd.get("year"),
+            existing_year=existing.year,
+            new_venue=pd.get("venue"),
+            existing_venue=existing.venue,
+        )
+        results.append((existing, info))
+    return results
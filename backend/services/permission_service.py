@@ -12,6 +12,9 @@ def check_collection_permission(
     """
     Check if a user has permission to access a collection.
 
+    Results are memoized per session (i.e. per request), so routes that
+    check the same permission more than once only pay for it once.
+
     Args:
         user_id: User ID, or None for unauthenticated users
         collection_id: Collection ID
@@ -20,7 +23,22 @@ def check_collection_permission(
     Returns:
         True if the user has the required permission
     """
-    collection = db.query(Collection).filter(Collection.id == collection_id).first()
+    cache = db.info.setdefault("permission_cache", {})
+    key = (user_id, collection_id, required_permission)
+    if key not in cache:
+        cache[key] = _check_collection_permission(
+            db, user_id, collection_id, required_permission
+        )
+    return cache[key]
+
+
+def _check_collection_permission(
+    db: Session,
+    user_id: str | None,
+    collection_id: str,
+    required_permission: str,
+) -> bool:
+    collection = db.get(Collection, collection_id)
     if not collection:
         return False
 
@@ -0,0 +1,111 @@
+"""
+Full-text search over papers, backed by SQLite FTS5.
+
+Substring ILIKE with leading wildcards scans the whole papers table, which
+becomes the dominant search latency as the corpus grows. This module keeps
+an FTS5 index over title/abstract (external-content table synced by
+triggers) so search is a posting-list lookup ordered by bm25 rank.
+
+init_fts() is called from init_db(); if SQLite was built without FTS5 the
+module stays disabled and callers fall back to ILIKE.
+"""
+
+import logging
+
+from sqlalchemy import column, literal_column, text
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+_available = False
+
+# External-content FTS table: stores only the inverted index, reading row
+# text back from papers by rowid. Triggers keep it in sync; the 'delete'
+# command form is how fts5 external-content tables remove entries.
+_SETUP_STATEMENTS = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+        title, abstract,
+        content='papers', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS papers_fts_ai AFTER INSERT ON papers BEGIN
+        INSERT INTO papers_fts(rowid, title, abstract)
+        VALUES (new.rowid, new.title, coalesce(new.abstract, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS papers_fts_ad AFTER DELETE ON papers BEGIN
+        INSERT INTO papers_fts(papers_fts, rowid, title, abstract)
+        VALUES ('delete', old.rowid, old.title, coalesce(old.abstract, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS papers_fts_au
+    AFTER UPDATE OF title, abstract ON papers BEGIN
+        INSERT INTO papers_fts(papers_fts, rowid, title, abstract)
+        VALUES ('delete', old.rowid, old.title, coalesce(old.abstract, ''));
+        INSERT INTO papers_fts(rowid, title, abstract)
+        VALUES (new.rowid, new.title, coalesce(new.abstract, ''));
+    END
+    """,
+)
+
+
+def init_fts(engine) -> None:
+    """Create the FTS index and sync triggers; index pre-existing rows once."""
+    global _available
+    try:
+        with engine.begin() as conn:
+            existed = conn.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='papers_fts'"
+            ).fetchone()
+            for stmt in _SETUP_STATEMENTS:
+                conn.exec_driver_sql(stmt)
+            if not existed:
+                # Papers imported before the index existed aren't covered by
+                # the triggers; rebuild pulls them in from the content table.
+                conn.exec_driver_sql(
+                    "INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')"
+                )
+        _available = True
+    except OperationalError:
+        logger.warning("SQLite lacks FTS5; paper search falls back to ILIKE")
+        _available = False
+
+
+def fts_available() -> bool:
+    return _available
+
+
+def match_expression(q: str) -> str | None:
+    """Turn a user query into an FTS5 MATCH string (AND of quoted tokens).
+
+    Returns None when FTS is unavailable or the query is a single character,
+    which tokenizes poorly — callers should fall back to ILIKE then.
+    """
+    if not _available or len(q.strip()) < 2:
+        return None
+    tokens = q.split()
+    if not tokens:
+        return None
+    # Quoting each token neutralizes FTS5 query syntax in user input.
+    return " ".join('"{}"'.format(t.replace('"', '""')) for t in tokens)
+
+
+def apply_fts(query, match: str):
+    """Join an ORM papers query against the FTS index for the given match.
+
+    Returns (query, rank) where rank is an ascending-is-better ordering
+    column (bm25 via fts5's built-in rank).
+    """
+    hits = (
+        text("SELECT rowid AS rid, rank AS score FROM papers_fts WHERE papers_fts MATCH :fts_q")
+        .bindparams(fts_q=match)
+        .columns(column("rid"), column("score"))
+        .subquery("fts_hits")
+    )
+    query = query.join(hits, hits.c.rid == literal_column("papers.rowid"))
+    return query, hits.c.score